@@ -1,14 +1,19 @@
 
 import numpy as np
-import matplotlib.pyplot as plt
-from scipy.io import wavfile
+
+# scipy is imported inside the functions that need it, so importing this
+# module (e.g. for iter_blocks) does not load it.
 
 def fft_filter(audio_data, sample_rate, cutoff_freq, filter_type='low'):
     """
     Applies a low-pass or high-pass filter to the input audio data using FFT.
 
+    Uses a real FFT zero-padded to a fast composite length (prime lengths are
+    much slower), then trims back to the input length. A 2D input
+    (samples x channels) is filtered in one batched transform along axis 0.
+
     Parameters:
-        audio_data (np.array): The raw audio signal
+        audio_data (np.array): The raw audio signal, 1D or (samples x channels)
         sample_rate (int): Sampling rate of the audio
         cutoff_freq (float): Cutoff frequency in Hz
         filter_type (str): 'low' for low-pass, 'high' for high-pass
@@ -16,25 +21,146 @@ def fft_filter(audio_data, sample_rate, cutoff_freq, filter_type='low'):
     Returns:
         np.array: Filtered audio signal
     """
+    from scipy.fft import rfft, irfft, rfftfreq, next_fast_len
+    if filter_type not in ('low', 'high'):
+        raise ValueError("Invalid filter_type. Use 'low' or 'high'.")
+
     N = len(audio_data)
-    freq = np.fft.fftfreq(N, d=1/sample_rate)  # Frequency axis
-    fft_audio = np.fft.fft(audio_data)
+    n_fft = next_fast_len(N, real=True)
+    freq = rfftfreq(n_fft, d=1/sample_rate)  # Frequency axis (non-negative half)
+    fft_audio = rfft(audio_data, n=n_fft, axis=0)
 
     if filter_type == 'low':
-        fft_audio[np.abs(freq) > cutoff_freq] = 0
+        fft_audio[freq > cutoff_freq] = 0
+    else:
+        fft_audio[freq < cutoff_freq] = 0
+
+    filtered_audio = irfft(fft_audio, n=n_fft, axis=0)[:N]
+    return filtered_audio.astype(audio_data.dtype)
+
+
+def brickwall_fir(sample_rate, cutoff_freq, filter_type='low', num_taps=4097):
+    """
+    Designs a linear-phase FIR approximating the brick-wall mask of fft_filter.
+
+    Windowed sinc (Blackman window); the transition band is about
+    5.5 * sample_rate / num_taps Hz wide, so longer filters are sharper.
+
+    Parameters:
+        sample_rate (int): Sampling rate of the audio
+        cutoff_freq (float): Cutoff frequency in Hz
+        filter_type (str): 'low' for low-pass, 'high' for high-pass
+        num_taps (int): Filter length (odd, so the delay is a whole sample count)
+
+    Returns:
+        np.array: FIR coefficients (float64), group delay (num_taps - 1) // 2
+    """
+    if num_taps % 2 == 0:
+        raise ValueError("num_taps must be odd.")
+
+    n = np.arange(num_taps) - (num_taps - 1) // 2
+    fc = cutoff_freq / sample_rate
+    taps = 2 * fc * np.sinc(2 * fc * n) * np.blackman(num_taps)
+    taps /= taps.sum()  # Unity gain at DC
+
+    if filter_type == 'low':
+        return taps
     elif filter_type == 'high':
-        fft_audio[np.abs(freq) < cutoff_freq] = 0
+        # Spectral inversion: delta - low-pass
+        taps = -taps
+        taps[(num_taps - 1) // 2] += 1
+        return taps
     else:
         raise ValueError("Invalid filter_type. Use 'low' or 'high'.")
 
-    filtered_audio = np.fft.ifft(fft_audio)
-    return np.real(filtered_audio).astype(audio_data.dtype)
+
+def iter_blocks(audio_data, block_size=4096):
+    """Yields consecutive blocks of block_size samples (the last may be shorter)."""
+    for start in range(0, len(audio_data), block_size):
+        yield audio_data[start:start + block_size]
+
+
+def fft_filter_stream(blocks, sample_rate, cutoff_freq, filter_type='low', num_taps=4097, fft_size=None):
+    """
+    Streaming low-pass/high-pass filter using FFT overlap-add.
+
+    Blocks of any size are buffered into hops of fft_size - num_taps + 1
+    samples; each hop is convolved with brickwall_fir via one real FFT and its
+    tail is carried into the next hop. The FIR delay is compensated, so the
+    concatenated output lines up with the input sample for sample and matches
+    fft_filter away from the edges (up to the FIR transition band). Memory
+    stays constant regardless of the stream length.
+
+    Parameters:
+        blocks (iterable): 1D sample blocks, e.g. iter_blocks(audio_data)
+        sample_rate (int): Sampling rate of the audio
+        cutoff_freq (float): Cutoff frequency in Hz
+        filter_type (str): 'low' for low-pass, 'high' for high-pass
+        num_taps (int): FIR length (odd)
+        fft_size (int): FFT length (default: power of two >= 4 * num_taps)
+
+    Yields:
+        np.array: Filtered blocks (same dtype as the input blocks)
+    """
+    taps = brickwall_fir(sample_rate, cutoff_freq, filter_type, num_taps)
+    if fft_size is None:
+        fft_size = 1 << (4 * num_taps - 1).bit_length()
+    hop = fft_size - num_taps + 1
+    if hop < 1:
+        raise ValueError("fft_size must be at least num_taps.")
+
+    spectrum = np.fft.rfft(taps, fft_size)
+    delay = (num_taps - 1) // 2
+    pending = np.zeros(0)               # Input not yet filtered (< hop samples)
+    tail = np.zeros(num_taps - 1)       # Overlap carried into the next hop
+    to_skip = delay                     # Leading samples of pure filter delay
+    total_in = total_out = 0
+    dtype = None
+
+    def convolve_hop(chunk):
+        nonlocal tail
+        out = np.fft.irfft(np.fft.rfft(chunk, fft_size) * spectrum, fft_size)
+        out[:num_taps - 1] += tail
+        tail = out[len(chunk):len(chunk) + num_taps - 1].copy()
+        return out[:len(chunk)]
+
+    def emit(filtered):
+        nonlocal to_skip, total_out
+        if to_skip:
+            dropped = min(to_skip, len(filtered))
+            filtered = filtered[dropped:]
+            to_skip -= dropped
+        filtered = filtered[:total_in - total_out]
+        total_out += len(filtered)
+        return filtered.astype(dtype)
+
+    for block in blocks:
+        block = np.asarray(block)
+        if dtype is None:
+            dtype = block.dtype
+        total_in += len(block)
+        pending = np.concatenate((pending, block))
+        while len(pending) >= hop:
+            filtered = emit(convolve_hop(pending[:hop]))
+            pending = pending[hop:]
+            if len(filtered):
+                yield filtered
+
+    if dtype is None:
+        return
+
+    # Flush: the remaining input, then the tail holding the delayed samples
+    filtered = emit(np.concatenate((convolve_hop(pending), tail)))
+    if len(filtered):
+        yield filtered
 
 
 def load_audio(file_path):
+    from scipy.io import wavfile
     sample_rate, data = wavfile.read(file_path)
     return sample_rate, data
 
 
 def save_audio(file_path, sample_rate, data):
+    from scipy.io import wavfile
     wavfile.write(file_path, sample_rate, data)
\ No newline at end of file
@@ -0,0 +1,230 @@
+import argparse
+import glob
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import cache
+from buffers import release_scratch
+from registry import FILTERS, apply_filter
+
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.bmp', '.tif', '.tiff')
+
+
+def _parse_value(text: str):
+    """Parses a filter parameter as int, then float, falling back to the raw string."""
+    for cast in (int, float):
+        try:
+            return cast(text)
+        except ValueError:
+            pass
+    return text
+
+
+def parse_filter_chain(spec: str) -> list:
+    """
+    Parses a filter chain such as "grayscale,resize:height=256:width=256".
+
+    Args:
+        spec (str): Comma-separated filters, each optionally followed by
+            colon-separated key=value parameters.
+
+    Returns:
+        list: [(filter_name, params_dict), ...] in application order.
+    """
+    chain = []
+    for step in filter(None, (s.strip() for s in spec.split(','))):
+        name, *pairs = step.split(':')
+        if name not in FILTERS:
+            raise ValueError(f"Unknown filter '{name}'. Available: {', '.join(sorted(FILTERS))}")
+        params = {}
+        for pair in pairs:
+            key, sep, value = pair.partition('=')
+            if not sep:
+                raise ValueError(f"Invalid parameter '{pair}' for filter '{name}' (expected key=value)")
+            params[key] = _parse_value(value)
+        chain.append((name, params))
+    if not chain:
+        raise ValueError("Filter chain is empty.")
+    return chain
+
+
+def collect_inputs(inputs: list) -> list:
+    """
+    Expands directories and glob patterns into a sorted list of image files.
+
+    Args:
+        inputs (list): Directories, glob patterns or file paths.
+
+    Returns:
+        list: Unique image file paths.
+    """
+    files = set()
+    for item in inputs:
+        if os.path.isdir(item):
+            candidates = (os.path.join(item, name) for name in os.listdir(item))
+        else:
+            candidates = glob.glob(item)
+        files.update(p for p in candidates
+                     if os.path.isfile(p) and p.lower().endswith(IMAGE_EXTENSIONS))
+    return sorted(files)
+
+
+def output_path_for(path: str, output_dir: str, extension: str = None) -> str:
+    """Returns where the result for an input file is written."""
+    stem, ext = os.path.splitext(os.path.basename(path))
+    return os.path.join(output_dir, stem + (extension or ext))
+
+
+def _write_image(out_path: str, image) -> None:
+    """Writes an image through a temp file in the same directory, so a killed run never leaves a partial output."""
+    import imageio
+    directory, name = os.path.split(out_path)
+    fd, tmp_path = tempfile.mkstemp(prefix='.' + name + '.', suffix=os.path.splitext(name)[1], dir=directory or '.')
+    os.close(fd)
+    try:
+        imageio.imwrite(tmp_path, image)
+        os.replace(tmp_path, out_path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+
+def process_file(path: str, chain: list, out_path: str, cache_dir: str = None) -> tuple:
+    """
+    Loads one image, applies the filter chain and saves the result.
+
+    Runs in a worker process, so it must only use picklable arguments. With a
+    cache_dir, step results are looked up in / stored to the on-disk result
+    cache (the worker keeps no in-memory tier), so a rerun with an extended
+    chain only computes the new steps.
+
+    Returns:
+        tuple: (path, megapixels, seconds, error message or None)
+    """
+    import imageio  # Only workers decode images; the parent just schedules
+    start = time.perf_counter()
+    try:
+        img = imageio.imread(path)
+        megapixels = img.shape[0] * img.shape[1] / 1e6
+        if cache_dir:
+            # Only the shared disk tier helps across files; a per-worker
+            # memory tier would just hold results no other file reuses
+            cache.configure(memory_bytes=0, disk_dir=cache_dir)
+            img = cache.run_chain(img, chain)
+        else:
+            for name, params in chain:
+                img = apply_filter(img, name, **params)
+        _write_image(out_path, img)
+        return path, megapixels, time.perf_counter() - start, None
+    except Exception as e:
+        return path, 0.0, time.perf_counter() - start, str(e)
+    finally:
+        release_scratch()  # Files differ in size, so buffers would rarely be reused
+
+
+def run_batch(inputs: list, chain: list, output_dir: str, workers: int = None,
+              skip_existing: bool = True, extension: str = None, cache_dir: str = None) -> dict:
+    """
+    Processes image files in parallel across a process pool, without plotting.
+
+    Outputs are named after the input file, so inputs that would share an
+    output (the same name in two directories, or two extensions with one
+    output format) raise ValueError before anything is written.
+
+    Args:
+        inputs (list): Directories, glob patterns or file paths.
+        chain (list): Filter chain from parse_filter_chain.
+        output_dir (str): Directory for the results (created if missing).
+        workers (int): Worker processes (default: CPU count).
+        skip_existing (bool): Skip files whose output already exists (resume).
+        extension (str): Output extension such as '.png' (default: keep input's).
+        cache_dir (str): Directory of the on-disk result cache (default: no cache).
+
+    Returns:
+        dict: Summary with processed/skipped/failed counts, seconds and throughput.
+    """
+    # Outputs are named after the input's basename, so two inputs may claim one
+    # output; they would overwrite each other (and break resuming), so refuse
+    sources = {}
+    for path in collect_inputs(inputs):
+        sources.setdefault(output_path_for(path, output_dir, extension), []).append(path)
+    collisions = [paths for paths in sources.values() if len(paths) > 1]
+    if collisions:
+        raise ValueError("Inputs map to the same output file: "
+                         + "; ".join(" and ".join(paths) for paths in collisions))
+
+    os.makedirs(output_dir, exist_ok=True)
+    jobs, skipped = [], 0
+    for out_path, (path,) in sources.items():
+        if skip_existing and os.path.exists(out_path):
+            skipped += 1
+            continue
+        jobs.append((path, out_path))
+
+    print(f"{len(jobs)} file(s) to process, {skipped} already done")
+    processed, failed, megapixels = 0, 0, 0.0
+    start = time.perf_counter()
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(process_file, path, chain, out_path, cache_dir) for path, out_path in jobs]
+        for future in as_completed(futures):
+            path, mp, seconds, error = future.result()
+            if error:
+                failed += 1
+                print(f"FAILED {path} ({seconds:.2f}s): {error}")
+            else:
+                processed += 1
+                megapixels += mp
+                print(f"{path}: {seconds:.2f}s ({mp / seconds if seconds else 0:.1f} MP/s)")
+
+    elapsed = time.perf_counter() - start
+    summary = {
+        'processed': processed,
+        'skipped': skipped,
+        'failed': failed,
+        'seconds': elapsed,
+        'files_per_second': processed / elapsed if elapsed else 0.0,
+        'megapixels_per_second': megapixels / elapsed if elapsed else 0.0,
+    }
+    print(f"Done: {processed} processed, {skipped} skipped, {failed} failed in {elapsed:.2f}s "
+          f"({summary['files_per_second']:.2f} files/s, {summary['megapixels_per_second']:.1f} MP/s)")
+    return summary
+
+
+def batch_main(argv: list = None) -> int:
+    """Command-line entry point for headless batch processing."""
+    parser = argparse.ArgumentParser(
+        description="Apply a filter chain to many images in parallel (no prompts, no plots).",
+        epilog=f"Filters: {', '.join(sorted(FILTERS))}. "
+               "Example: -f 'grayscale,resize:new_height=256:new_width=256'")
+    parser.add_argument('inputs', nargs='+', help="input directories, glob patterns or files")
+    parser.add_argument('-f', '--filters', required=True,
+                        help="comma-separated filter chain, parameters as name:key=value")
+    parser.add_argument('-o', '--output-dir', required=True, help="output directory")
+    parser.add_argument('-j', '--workers', type=int, default=None,
+                        help="worker processes (default: CPU count)")
+    parser.add_argument('--format', dest='extension', default=None,
+                        help="output extension, e.g. .png (default: same as input)")
+    parser.add_argument('--overwrite', action='store_true',
+                        help="reprocess files whose output already exists")
+    parser.add_argument('--cache-dir', default=None,
+                        help="reuse cached filter results from this directory across runs")
+    args = parser.parse_args(argv)
+
+    try:
+        chain = parse_filter_chain(args.filters)
+    except ValueError as e:
+        parser.error(str(e))
+
+    extension = args.extension
+    if extension and not extension.startswith('.'):
+        extension = '.' + extension
+    try:
+        summary = run_batch(args.inputs, chain, args.output_dir, args.workers,
+                            skip_existing=not args.overwrite, extension=extension,
+                            cache_dir=args.cache_dir)
+    except ValueError as e:
+        parser.error(str(e))
+    return 1 if summary['failed'] else 0
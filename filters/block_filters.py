@@ -0,0 +1,223 @@
+import time
+import numpy as np
+from scipy.signal import sosfilt, lfilter
+
+# Block-based (streaming) audio filters. Filters are designed here as either
+# FIR taps (1D array) or a cascade of biquads in second-order-section form
+# (n x 6 array of [b0, b1, b2, 1, a1, a2]). The filter state is an explicit
+# array carried from one block to the next, so a live input split into small
+# buffers is filtered exactly as if it were one long signal.
+
+DEFAULT_BLOCK_SIZE = 256
+
+
+'''FIR design'''
+def design_fir(sample_rate, cutoff, filter_type='low', num_taps=255):
+    """
+    Designs a linear-phase windowed-sinc FIR filter (Hamming window).
+
+    Parameters:
+        sample_rate (int): Sampling rate in Hz
+        cutoff (float or tuple): Cutoff in Hz, or (low, high) for 'band'
+        filter_type (str): 'low', 'high' or 'band'
+        num_taps (int): Filter length (odd); latency is (num_taps - 1) // 2 samples
+
+    Returns:
+        np.array: FIR taps
+    """
+    if num_taps % 2 == 0:
+        raise ValueError("num_taps must be odd.")
+
+    n = np.arange(num_taps) - (num_taps - 1) // 2
+    window = np.hamming(num_taps)
+
+    def lowpass(freq):
+        fc = freq / sample_rate
+        taps = 2 * fc * np.sinc(2 * fc * n) * window
+        return taps / taps.sum()  # Unity gain at DC
+
+    if filter_type == 'low':
+        return lowpass(cutoff)
+    elif filter_type == 'high':
+        taps = -lowpass(cutoff)
+        taps[(num_taps - 1) // 2] += 1  # Spectral inversion
+        return taps
+    elif filter_type == 'band':
+        low, high = cutoff
+        return lowpass(high) - lowpass(low)
+    else:
+        raise ValueError("Invalid filter_type. Use 'low', 'high' or 'band'.")
+
+
+'''Biquad design (RBJ audio EQ cookbook)'''
+def design_biquad(sample_rate, freq, filter_type='low', q=1 / np.sqrt(2), gain_db=0.0):
+    """
+    Designs one biquad section.
+
+    Parameters:
+        sample_rate (int): Sampling rate in Hz
+        freq (float): Cutoff / center / shelf frequency in Hz
+        filter_type (str): 'low', 'high', 'band', 'lowshelf' or 'highshelf'
+        q (float): Quality factor (shelf slope for shelving filters)
+        gain_db (float): Shelf gain in dB (shelving filters only)
+
+    Returns:
+        np.array: Section [b0, b1, b2, 1, a1, a2] (normalized so a0 = 1)
+    """
+    w0 = 2 * np.pi * freq / sample_rate
+    cos_w0, sin_w0 = np.cos(w0), np.sin(w0)
+    alpha = sin_w0 / (2 * q)
+
+    if filter_type == 'low':
+        b = [(1 - cos_w0) / 2, 1 - cos_w0, (1 - cos_w0) / 2]
+        a = [1 + alpha, -2 * cos_w0, 1 - alpha]
+    elif filter_type == 'high':
+        b = [(1 + cos_w0) / 2, -(1 + cos_w0), (1 + cos_w0) / 2]
+        a = [1 + alpha, -2 * cos_w0, 1 - alpha]
+    elif filter_type == 'band':  # Constant 0 dB peak gain
+        b = [alpha, 0.0, -alpha]
+        a = [1 + alpha, -2 * cos_w0, 1 - alpha]
+    elif filter_type in ('lowshelf', 'highshelf'):
+        A = 10 ** (gain_db / 40)
+        beta = 2 * np.sqrt(A) * alpha
+        sign = 1 if filter_type == 'lowshelf' else -1
+        b = [A * ((A + 1) - sign * (A - 1) * cos_w0 + beta),
+             sign * 2 * A * ((A - 1) - sign * (A + 1) * cos_w0),
+             A * ((A + 1) - sign * (A - 1) * cos_w0 - beta)]
+        a = [(A + 1) + sign * (A - 1) * cos_w0 + beta,
+             -sign * 2 * ((A - 1) + sign * (A + 1) * cos_w0),
+             (A + 1) + sign * (A - 1) * cos_w0 - beta]
+    else:
+        raise ValueError("Invalid filter_type. Use 'low', 'high', 'band', 'lowshelf' or 'highshelf'.")
+
+    return np.array(b + a) / a[0]
+
+
+def design_biquad_cascade(sample_rate, freq, filter_type='low', order=4, q=1 / np.sqrt(2), gain_db=0.0):
+    """
+    Designs a cascade of biquads as second-order sections.
+
+    Low/high-pass cascades use Butterworth section Qs, giving a maximally flat
+    response of the given (even) order. Band-pass and shelving cascades repeat
+    the same section order // 2 times (shelf gain is split across sections).
+
+    Parameters:
+        sample_rate (int): Sampling rate in Hz
+        freq (float): Cutoff / center / shelf frequency in Hz
+        filter_type (str): 'low', 'high', 'band', 'lowshelf' or 'highshelf'
+        order (int): Filter order (even, 2 per section)
+        q (float): Quality factor for band-pass and shelving sections
+        gain_db (float): Total shelf gain in dB
+
+    Returns:
+        np.array: Second-order sections, shape (order // 2, 6)
+    """
+    if order < 2 or order % 2:
+        raise ValueError("order must be an even number >= 2.")
+    sections = order // 2
+
+    if filter_type in ('low', 'high'):
+        # Butterworth poles: Q_k = 1 / (2 cos((2k + 1) pi / (2 order)))
+        qs = [1 / (2 * np.cos((2 * k + 1) * np.pi / (2 * order))) for k in range(sections)]
+        return np.stack([design_biquad(sample_rate, freq, filter_type, qk) for qk in qs])
+
+    section = design_biquad(sample_rate, freq, filter_type, q, gain_db / sections)
+    return np.tile(section, (sections, 1))
+
+
+'''Streaming application'''
+def init_state(coeffs):
+    """
+    Returns a zero filter state for FIR taps or second-order sections.
+
+    Parameters:
+        coeffs (np.array): FIR taps (1D) or sections (n x 6)
+
+    Returns:
+        np.array: State to pass to filter_block
+    """
+    if coeffs.ndim == 2:
+        return np.zeros((coeffs.shape[0], 2))
+    return np.zeros(len(coeffs) - 1)
+
+
+def filter_block(block, coeffs, state):
+    """
+    Filters one block, carrying the state across block boundaries.
+
+    Parameters:
+        block (np.array): 1D block of samples
+        coeffs (np.array): FIR taps (1D) or sections (n x 6)
+        state (np.array): State from init_state or the previous call
+
+    Returns:
+        tuple: (filtered block as float64, new state)
+    """
+    block = np.asarray(block, dtype=np.float64)
+    if coeffs.ndim == 2:
+        return sosfilt(coeffs, block, zi=state)
+    return lfilter(coeffs, 1.0, block, zi=state)
+
+
+def latency_samples(coeffs, block_size=DEFAULT_BLOCK_SIZE):
+    """
+    Fixed input-to-output latency in samples: one block of buffering plus the
+    FIR group delay (biquad cascades add no fixed algorithmic delay).
+    """
+    if coeffs.ndim == 2:
+        return block_size
+    return block_size + (len(coeffs) - 1) // 2
+
+
+def stream_filter(blocks, coeffs):
+    """
+    Filters an iterable of sample blocks, yielding one output block per input block.
+
+    Integer blocks are clipped back to their dtype; float blocks keep theirs.
+
+    Parameters:
+        blocks (iterable): 1D sample blocks (e.g. live 256-sample buffers)
+        coeffs (np.array): FIR taps (1D) or sections (n x 6)
+
+    Yields:
+        np.array: Filtered blocks
+    """
+    state = init_state(coeffs)
+    for block in blocks:
+        block = np.asarray(block)
+        filtered, state = filter_block(block, coeffs, state)
+        if np.issubdtype(block.dtype, np.integer):
+            info = np.iinfo(block.dtype)
+            filtered = np.clip(np.rint(filtered), info.min, info.max)
+        yield filtered.astype(block.dtype)
+
+
+def measure_block_throughput(coeffs, block_size=DEFAULT_BLOCK_SIZE, sample_rate=44100, seconds=2.0):
+    """
+    Measures how fast blocks are filtered compared with real time.
+
+    Parameters:
+        coeffs (np.array): FIR taps (1D) or sections (n x 6)
+        block_size (int): Samples per block
+        sample_rate (int): Sampling rate used for the real-time factor
+        seconds (float): Duration of synthetic noise to filter
+
+    Returns:
+        dict: us_per_block, samples_per_second and realtime_factor
+            (> 1 means faster than real time)
+    """
+    n_blocks = max(1, int(seconds * sample_rate) // block_size)
+    blocks = np.random.default_rng(0).standard_normal((n_blocks, block_size))
+    state = init_state(coeffs)
+
+    start = time.perf_counter()
+    for block in blocks:
+        _, state = filter_block(block, coeffs, state)
+    elapsed = time.perf_counter() - start
+
+    samples_per_second = n_blocks * block_size / elapsed
+    return {
+        'us_per_block': elapsed / n_blocks * 1e6,
+        'samples_per_second': samples_per_second,
+        'realtime_factor': samples_per_second / sample_rate,
+    }
@@ -1,14 +1,25 @@
 import numpy as np
+from point_ops import brightness_lut, apply_lut
+from buffers import scratch, prepare_out
 
-def adjust_brightness(image: np.ndarray, factor: float) -> np.ndarray:
+def adjust_brightness(image: np.ndarray, factor: float, out: np.ndarray = None) -> np.ndarray:
     """Adjusts image brightness by scaling pixel values.
     
     Args:
         image: Input image (2D or 3D array).
         factor: Brightness multiplier (e.g., 1.0 = no change).
+        out: Optional preallocated uint8 output; may be the input itself.
     
     Returns:
         np.ndarray: Brightness-adjusted image clipped to [0, 255].
     """
-    adjusted = image.astype(np.float32) * factor
-    return np.clip(adjusted, 0, 255).astype(np.uint8)
\ No newline at end of file
+    if image.dtype == np.uint8:  # Point operation: one table gather
+        return apply_lut(image, brightness_lut(factor), out=out)
+
+    adjusted = scratch('brightness.adjusted', image.shape)
+    adjusted[...] = image
+    adjusted *= factor
+    np.clip(adjusted, 0, 255, out=adjusted)
+    out = prepare_out(out, image.shape, np.uint8)
+    np.copyto(out, adjusted, casting='unsafe')
+    return out
@@ -0,0 +1,87 @@
+import math
+import threading
+from collections import OrderedDict
+import numpy as np
+
+# Reusable scratch space for filter temporaries. A filter asks for a buffer by
+# tag, shape and dtype and gets a view into memory obtained on an earlier call,
+# so processing a stream of same-shaped frames allocates no image-sized arrays
+# after the first frame. Pools are per thread (run_threaded calls filters from
+# a thread pool); buffers larger than MAX_RETAINED_BYTES are not kept, and a
+# pool holding more than MAX_POOL_BYTES drops its least recently used buffers.
+# Dropping only forgets a buffer: views a caller still holds stay valid.
+
+MAX_RETAINED_BYTES = 64 * 1024 * 1024
+MAX_POOL_BYTES = 128 * 1024 * 1024
+
+_local = threading.local()
+
+
+def scratch(tag: str, shape: tuple, dtype=np.float32) -> np.ndarray:
+    """
+    Returns a reusable, uninitialized buffer.
+
+    The contents stay valid until the next scratch() call with the same tag in
+    the same thread, so every caller uses its own tags (e.g. 'sobel.gx') and a
+    scratch buffer is never returned to the user.
+
+    Args:
+        tag (str): Name of the temporary.
+        shape (tuple): Requested shape.
+        dtype: Requested dtype (default float32).
+
+    Returns:
+        np.ndarray: C-contiguous array of the requested shape and dtype.
+    """
+    dtype = np.dtype(dtype)
+    nbytes = math.prod(shape) * dtype.itemsize
+    pool = getattr(_local, 'pool', None)
+    if pool is None:
+        pool = _local.pool = OrderedDict()
+        _local.pool_bytes = 0
+
+    buffer = pool.get(tag)
+    if buffer is not None and buffer.nbytes >= nbytes:
+        pool.move_to_end(tag)
+    else:
+        if buffer is not None:
+            _local.pool_bytes -= pool.pop(tag).nbytes
+        buffer = np.empty(nbytes, dtype=np.uint8)
+        if nbytes <= MAX_RETAINED_BYTES:
+            pool[tag] = buffer
+            _local.pool_bytes += nbytes
+            while _local.pool_bytes > MAX_POOL_BYTES:
+                _, dropped = pool.popitem(last=False)
+                _local.pool_bytes -= dropped.nbytes
+    return buffer[:nbytes].view(dtype).reshape(shape)
+
+
+def scratch_bytes() -> int:
+    """Returns the bytes held by the calling thread's scratch buffers."""
+    return getattr(_local, 'pool_bytes', 0)
+
+
+def release_scratch() -> None:
+    """Frees the calling thread's scratch buffers."""
+    _local.pool = OrderedDict()
+    _local.pool_bytes = 0
+
+
+def prepare_out(out: np.ndarray, shape: tuple, dtype) -> np.ndarray:
+    """
+    Validates a caller-supplied output buffer, or allocates one if out is None.
+
+    Args:
+        out (np.ndarray): Preallocated output or None.
+        shape (tuple): Required shape.
+        dtype: Required dtype.
+
+    Returns:
+        np.ndarray: Array to write the result into.
+    """
+    if out is None:
+        return np.empty(shape, dtype=dtype)
+    if out.shape != tuple(shape) or out.dtype != dtype:
+        raise ValueError(f"out must have shape {tuple(shape)} and dtype {np.dtype(dtype)}, "
+                         f"got {out.shape} and {out.dtype}.")
+    return out
@@ -0,0 +1,224 @@
+import hashlib
+import os
+import tempfile
+from collections import OrderedDict
+import numpy as np
+from registry import apply_filter
+
+# Content-addressed memoization of filter results. A result is keyed by the
+# hash of its input content plus the filter name and parameters; keys of chain
+# steps are derived from the previous step's key, so after hashing the source
+# image once, every prefix of a chain (e.g. the grayscale step before edge
+# detection) is found without rehashing any pixels.
+#
+# Two tiers: an in-memory LRU bounded by bytes, and an optional on-disk tier
+# of .npy files evicted oldest-used first once it exceeds its byte budget.
+# Cached arrays are returned read-only.
+
+DEFAULT_MEMORY_BYTES = 512 * 1024 * 1024
+DEFAULT_DISK_BYTES = 4 * 1024 * 1024 * 1024
+
+_memory = OrderedDict()
+_memory_bytes = 0
+_memory_limit = DEFAULT_MEMORY_BYTES
+_disk_dir = None
+_disk_limit = DEFAULT_DISK_BYTES
+_stats = {'hits': 0, 'disk_hits': 0, 'misses': 0}
+
+
+def configure(memory_bytes: int = None, disk_dir: str = None, disk_bytes: int = None) -> None:
+    """
+    Sets the cache budgets and enables/disables the disk tier.
+
+    Args:
+        memory_bytes (int): In-memory LRU budget in bytes (0 disables it).
+        disk_dir (str): Directory for the .npy disk tier ('' disables it).
+        disk_bytes (int): Disk tier budget in bytes.
+    """
+    global _memory_limit, _disk_dir, _disk_limit
+    if memory_bytes is not None:
+        _memory_limit = memory_bytes
+        _evict_memory()
+    if disk_dir is not None:
+        _disk_dir = disk_dir or None
+        if _disk_dir:
+            os.makedirs(_disk_dir, exist_ok=True)
+    if disk_bytes is not None:
+        _disk_limit = disk_bytes
+        _evict_disk()
+
+
+def clear(disk: bool = False) -> None:
+    """Empties the memory tier (and the disk tier if disk=True)."""
+    global _memory_bytes
+    _memory.clear()
+    _memory_bytes = 0
+    if disk and _disk_dir:
+        for name in os.listdir(_disk_dir):
+            if name.endswith('.npy'):
+                os.remove(os.path.join(_disk_dir, name))
+
+
+def stats() -> dict:
+    """Returns hit/miss counters and current tier sizes."""
+    return dict(_stats, memory_entries=len(_memory), memory_bytes=_memory_bytes)
+
+
+'''Keys'''
+def content_key(image: np.ndarray) -> str:
+    """Hashes an array's shape, dtype and pixel content."""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(repr((image.shape, image.dtype.str)).encode())
+    digest.update(memoryview(np.ascontiguousarray(image)).cast('B'))
+    return digest.hexdigest()
+
+
+def step_key(parent_key: str, name: str, params: dict) -> str:
+    """Derives the key of a filter applied to the result identified by parent_key."""
+    text = f"{parent_key}|{name}|{sorted(params.items())!r}"
+    return hashlib.blake2b(text.encode(), digest_size=16).hexdigest()
+
+
+'''Tiers'''
+def _evict_memory() -> None:
+    """Drops least recently used entries until the memory tier fits its budget."""
+    global _memory_bytes
+    while _memory and _memory_bytes > _memory_limit:
+        _, array = _memory.popitem(last=False)
+        _memory_bytes -= array.nbytes
+
+
+def _evict_disk() -> None:
+    """Deletes the least recently used .npy files until the disk tier fits its budget."""
+    if not _disk_dir:
+        return
+    # Batch workers share the directory, so any file may vanish at any time
+    entries = []
+    for name in os.listdir(_disk_dir):
+        if name.endswith('.npy'):
+            try:
+                st = os.stat(os.path.join(_disk_dir, name))
+            except FileNotFoundError:
+                continue
+            entries.append((st.st_mtime, st.st_size, name))
+    total = sum(size for _, size, _ in entries)
+    for _, size, name in sorted(entries):
+        if total <= _disk_limit:
+            break
+        try:
+            os.remove(os.path.join(_disk_dir, name))
+        except FileNotFoundError:  # Already evicted by another process
+            pass
+        total -= size
+
+
+def _remember(key: str, array: np.ndarray) -> None:
+    """Adds an array to the memory tier."""
+    global _memory_bytes
+    if array.nbytes > _memory_limit:
+        return
+    if key in _memory:
+        _memory_bytes -= _memory.pop(key).nbytes
+    _memory[key] = array
+    _memory_bytes += array.nbytes
+    _evict_memory()
+
+
+def get(key: str):
+    """Returns the cached array for a key, or None."""
+    if key in _memory:
+        _memory.move_to_end(key)
+        _stats['hits'] += 1
+        return _memory[key]
+
+    if _disk_dir:
+        path = os.path.join(_disk_dir, key + '.npy')
+        try:
+            array = np.load(path)
+            os.utime(path)  # Mark as recently used
+        except OSError:
+            array = None
+        except ValueError:  # Corrupt or truncated file: drop it so the key is recomputed
+            array = None
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+        if array is not None:
+            array.flags.writeable = False
+            _remember(key, array)
+            _stats['disk_hits'] += 1
+            return array
+
+    _stats['misses'] += 1
+    return None
+
+
+def put(key: str, array: np.ndarray, copy: bool = True) -> np.ndarray:
+    """
+    Stores an array under a key and returns the cached (read-only) array.
+
+    The cache freezes what it stores, so it stores a copy unless told that
+    nobody else holds the array. Views are always copied so a cache entry
+    never pins or aliases another buffer.
+
+    Args:
+        key (str): Cache key.
+        array (np.ndarray): Array to store.
+        copy (bool): Store a copy (the caller keeps ownership of array); pass
+            False only for a fresh array the caller hands over.
+    """
+    if copy or array.base is not None:
+        array = array.copy()
+    array.flags.writeable = False
+    _remember(key, array)
+
+    if _disk_dir:
+        # Write to a temp file first so concurrent readers never see a partial file
+        fd, tmp_path = tempfile.mkstemp(suffix='.tmp', dir=_disk_dir)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                np.save(f, array)
+            os.replace(tmp_path, os.path.join(_disk_dir, key + '.npy'))
+        except BaseException:  # e.g. disk full; eviction never sees .tmp files
+            os.remove(tmp_path)
+            raise
+        _evict_disk()
+    return array
+
+
+'''Cached execution'''
+def run_chain(image: np.ndarray, chain: list, key: str = None) -> np.ndarray:
+    """
+    Applies a chain of registered filters, reusing cached intermediate results.
+
+    The longest cached prefix of the chain is reused; only the remaining steps
+    are computed, and each of their results is cached in turn.
+
+    Args:
+        image (np.ndarray): Source image.
+        chain (list): [(filter_name, params_dict), ...] as in batch.parse_filter_chain.
+        key (str): content_key(image), if already known.
+
+    Returns:
+        np.ndarray: Result of the last step (read-only), or image for an empty chain.
+    """
+    keys = [key or content_key(image)]
+    for name, params in chain:
+        keys.append(step_key(keys[-1], name, params))
+
+    # Find the longest cached prefix, then compute forward from it
+    start, result = 0, image
+    for i in range(len(chain), 0, -1):
+        cached = get(keys[i])
+        if cached is not None:
+            start, result = i, cached
+            break
+
+    for i in range(start, len(chain)):
+        name, params = chain[i]
+        filtered = apply_filter(result, name, **params)
+        # A fresh filter output is handed over; a step that returns its input
+        # unchanged (e.g. grayscale of a gray image) must not freeze it
+        result = put(keys[i + 1], filtered, copy=filtered is result)
+    return result
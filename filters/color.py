@@ -0,0 +1,217 @@
+import numpy as np
+from buffers import scratch, prepare_out
+
+# Colour-space helpers for channels-last images. A 4th (alpha) channel is
+# ignored by conversions and passed through by colour adjustments; 2D and
+# single-channel images count as already gray. Channels are always read
+# through views, so no input is copied.
+#
+# Luminance uses Rec. 601 weights in 8-bit fixed point:
+# (77 R + 150 G + 29 B + 128) >> 8 accumulates in uint16 (at most 65408) and
+# rounds to nearest, with no float temporaries.
+
+LUMA_WEIGHTS = (77, 150, 29)  # 0.299, 0.587, 0.114 scaled by 256
+
+# Pixels converted per block; keeps the uint16 accumulators in cache
+_BLOCK_PIXELS = 1 << 16
+
+
+def rgb_channels(image: np.ndarray) -> tuple:
+    """
+    Returns views of the red, green and blue planes.
+
+    Args:
+        image (np.ndarray): 2D image or 3D image with 1, 3 or 4 channels.
+
+    Returns:
+        tuple: (r, g, b) 2D views; gray input gives the same view three times.
+    """
+    if image.ndim == 2:
+        return image, image, image
+    if image.ndim != 3 or image.shape[2] not in (1, 3, 4):
+        raise ValueError("Expected a 2D image or a 3D image with 1, 3 or 4 channels.")
+    if image.shape[2] == 1:
+        return (image[:, :, 0],) * 3
+    return image[:, :, 0], image[:, :, 1], image[:, :, 2]
+
+
+def is_gray(image: np.ndarray) -> bool:
+    """True for 2D and single-channel images."""
+    return image.ndim == 2 or (image.ndim == 3 and image.shape[2] == 1)
+
+
+def _round_to_uint8(values: np.ndarray, out: np.ndarray) -> np.ndarray:
+    """Rounds float32 values (in place) and writes them clipped to [0, 255] into a uint8 output."""
+    np.rint(values, out=values)
+    np.clip(values, 0, 255, out=values)
+    out = prepare_out(out, values.shape, np.uint8)
+    np.copyto(out, values, casting='unsafe')
+    return out
+
+
+def rgb_to_gray(image: np.ndarray, out: np.ndarray = None) -> np.ndarray:
+    """
+    Computes luminance with fixed-point weights.
+
+    Args:
+        image (np.ndarray): RGB or RGBA image (alpha ignored); uint8 gray
+            input is returned as is (a 2D view for a single-channel image),
+            other gray input is rounded and clipped.
+        out (np.ndarray): Optional preallocated (height, width) uint8 output.
+
+    Returns:
+        np.ndarray: 2D uint8 luminance image.
+    """
+    if is_gray(image):
+        gray = image if image.ndim == 2 else image[:, :, 0]
+        if gray.dtype != np.uint8:  # Rounded and clipped like colour input
+            values = scratch('color.gray', gray.shape)
+            values[...] = gray
+            return _round_to_uint8(values, out)
+        if out is None:
+            return gray
+        np.copyto(out, gray)
+        return out
+
+    r, g, b = rgb_channels(image)
+    if image.dtype != np.uint8:  # Same weights in float32, rounded and clipped
+        gray = scratch('color.gray', r.shape)
+        np.multiply(r, np.float32(LUMA_WEIGHTS[0] / 256), out=gray)
+        gray += g * np.float32(LUMA_WEIGHTS[1] / 256)
+        gray += b * np.float32(LUMA_WEIGHTS[2] / 256)
+        return _round_to_uint8(gray, out)
+
+    out = prepare_out(out, r.shape, np.uint8)
+
+    block_rows = max(1, _BLOCK_PIXELS // r.shape[1])
+    for start in range(0, r.shape[0], block_rows):
+        rows = slice(start, start + block_rows)
+        shape = r[rows].shape
+        acc = scratch('color.acc', shape, np.uint16)
+        term = scratch('color.term', shape, np.uint16)
+        np.multiply(r[rows], np.uint16(LUMA_WEIGHTS[0]), out=acc)
+        acc += np.multiply(g[rows], np.uint16(LUMA_WEIGHTS[1]), out=term)
+        acc += np.multiply(b[rows], np.uint16(LUMA_WEIGHTS[2]), out=term)
+        acc += 128
+        acc >>= 8
+        np.copyto(out[rows], acc, casting='unsafe')
+    return out
+
+
+def _max_min(image: np.ndarray) -> tuple:
+    """Returns float32 (r, g, b, max, min) planes scaled to [0, 1]."""
+    r, g, b = (np.asarray(c, dtype=np.float32) / 255 for c in rgb_channels(image))
+    return r, g, b, np.maximum(np.maximum(r, g), b), np.minimum(np.minimum(r, g), b)
+
+
+def _hue(r, g, b, high, delta) -> np.ndarray:
+    """Hue in [0, 1) from the RGB planes, their maximum and max - min (0 for grays)."""
+    safe = np.where(delta > 0, delta, 1)
+    hue = np.where(high == r, (g - b) / safe,
+                   np.where(high == g, 2 + (b - r) / safe, 4 + (r - g) / safe))
+    hue /= 6
+    hue %= 1
+    hue[delta == 0] = 0
+    return hue
+
+
+def rgb_to_hsv(image: np.ndarray, out: np.ndarray = None) -> np.ndarray:
+    """
+    Converts RGB (or RGBA, alpha ignored) to HSV.
+
+    Args:
+        image (np.ndarray): 8-bit range image (gray input gives zero saturation).
+        out (np.ndarray): Optional preallocated (height, width, 3) float32 output.
+
+    Returns:
+        np.ndarray: float32 hue, saturation, value planes, each in [0, 1].
+    """
+    r, g, b, high, low = _max_min(image)
+    delta = high - low
+    out = prepare_out(out, high.shape + (3,), np.float32)
+    out[..., 0] = _hue(r, g, b, high, delta)
+    np.divide(delta, high, out=out[..., 1], where=high > 0)
+    out[..., 1][high == 0] = 0
+    out[..., 2] = high
+    return out
+
+
+def rgb_to_hsl(image: np.ndarray, out: np.ndarray = None) -> np.ndarray:
+    """
+    Converts RGB (or RGBA, alpha ignored) to HSL.
+
+    Args:
+        image (np.ndarray): 8-bit range image (gray input gives zero saturation).
+        out (np.ndarray): Optional preallocated (height, width, 3) float32 output.
+
+    Returns:
+        np.ndarray: float32 hue, saturation, lightness planes, each in [0, 1].
+    """
+    r, g, b, high, low = _max_min(image)
+    delta = high - low
+    lightness = (high + low) / 2
+    spread = 1 - np.abs(2 * lightness - 1)
+    out = prepare_out(out, high.shape + (3,), np.float32)
+    out[..., 0] = _hue(r, g, b, high, delta)
+    np.divide(delta, spread, out=out[..., 1], where=spread > 0)
+    out[..., 1][spread == 0] = 0
+    np.clip(out[..., 1], 0, 1, out=out[..., 1])  # Rounding can overshoot 1 slightly
+    out[..., 2] = lightness
+    return out
+
+
+def _to_rgb(planes: list, out: np.ndarray) -> np.ndarray:
+    """Writes [0, 1] float planes as rounded uint8 RGB."""
+    out = prepare_out(out, planes[0].shape + (3,), np.uint8)
+    for c, plane in enumerate(planes):
+        plane *= 255
+        np.rint(plane, out=plane)
+        np.clip(plane, 0, 255, out=plane)
+        np.copyto(out[..., c], plane, casting='unsafe')
+    return out
+
+
+def hsv_to_rgb(hsv: np.ndarray, out: np.ndarray = None) -> np.ndarray:
+    """
+    Converts HSV (each plane in [0, 1]) to RGB.
+
+    Channel n is v - v * s * clip(min(k, 4 - k), 0, 1) with k = (n + 6 h) mod 6
+    for n = 5, 3, 1 (red, green, blue).
+
+    Args:
+        hsv (np.ndarray): (height, width, 3) hue, saturation, value.
+        out (np.ndarray): Optional preallocated uint8 RGB output.
+
+    Returns:
+        np.ndarray: uint8 RGB image.
+    """
+    h, s, v = (hsv[..., i].astype(np.float32) for i in range(3))
+    chroma = v * s
+    planes = []
+    for n in (5, 3, 1):
+        k = (n + 6 * h) % 6
+        planes.append(v - chroma * np.clip(np.minimum(k, 4 - k), 0, 1))
+    return _to_rgb(planes, out)
+
+
+def hsl_to_rgb(hsl: np.ndarray, out: np.ndarray = None) -> np.ndarray:
+    """
+    Converts HSL (each plane in [0, 1]) to RGB.
+
+    Channel n is l - a * clip(min(k - 3, 9 - k), -1, 1) with a = s * min(l, 1 - l)
+    and k = (n + 12 h) mod 12 for n = 0, 8, 4 (red, green, blue).
+
+    Args:
+        hsl (np.ndarray): (height, width, 3) hue, saturation, lightness.
+        out (np.ndarray): Optional preallocated uint8 RGB output.
+
+    Returns:
+        np.ndarray: uint8 RGB image.
+    """
+    h, s, lightness = (hsl[..., i].astype(np.float32) for i in range(3))
+    amplitude = s * np.minimum(lightness, 1 - lightness)
+    planes = []
+    for n in (0, 8, 4):
+        k = (n + 12 * h) % 12
+        planes.append(lightness - amplitude * np.clip(np.minimum(k - 3, 9 - k), -1, 1))
+    return _to_rgb(planes, out)
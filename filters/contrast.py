@@ -1,25 +1,196 @@
 import numpy as np
+from point_ops import IDENTITY_LUT, contrast_lut, apply_lut
+from buffers import scratch, prepare_out
+
+# Contrast adjustments on uint8 images are driven by the channel histograms:
+# one bincount pass counts every channel at once (channel c's values offset by
+# 256 * c), the histograms become one 256-entry table per channel, and the
+# tables are applied with one gather. Stretch limits are histogram queries, so
+# percentile clipping (robust to a few hot or dead pixels) costs the same as a
+# plain min/max stretch. Other dtypes (uint16, float) have no 256-bin
+# histogram: the same limits are order statistics found with np.partition,
+# and equalization ranks the distinct values.
+
+CONTRAST_MODES = ('minmax', 'percentile', 'equalize')
+
+# Values counted per bincount call; bounds the index temporaries
+_HIST_BLOCK_VALUES = 1 << 18
+
+
+def _channel_index(block: np.ndarray, out: np.ndarray) -> np.ndarray:
+    """Writes value + 256 * channel of a channels-last uint8 block into a uint16 array."""
+    out[...] = block
+    for c in range(1, block.shape[2]):  # Strided in-place adds beat a broadcast add
+        out[..., c] += 256 * c
+    return out
+
+
+def channel_histograms(image: np.ndarray) -> np.ndarray:
+    """Counts the values of every channel of a uint8 image in one bincount pass.
+
+    Args:
+        image: uint8 image (2D grayscale or 3D with channels last).
+
+    Returns:
+        np.ndarray: (C, 256) int64 counts, C = 1 for a 2D image.
+    """
+    if image.dtype != np.uint8:
+        raise ValueError("Histograms require a uint8 image.")
+    channels = image.shape[2] if image.ndim == 3 else 1
+    counts = np.zeros(channels * 256, dtype=np.int64)
+
+    block_rows = max(1, _HIST_BLOCK_VALUES // max(1, image[0].size))
+    for start in range(0, image.shape[0], block_rows):
+        block = image[start:start + block_rows]
+        if channels > 1:
+            block = _channel_index(block, scratch('contrast.index', block.shape, np.uint16))
+        counts += np.bincount(block.ravel(), minlength=channels * 256)
+    return counts.reshape(channels, 256)
+
+
+def stretch_luts(hist: np.ndarray, min_out: int = 0, max_out: int = 255,
+                 low_pct: float = 0.0, high_pct: float = 100.0) -> np.ndarray:
+    """Builds linear stretch tables mapping [low, high] to [min_out, max_out].
+
+    Args:
+        hist: (C, 256) channel histograms.
+        min_out: Minimum output value.
+        max_out: Maximum output value.
+        low_pct: Percentile taken as the low input limit (0 = minimum).
+        high_pct: Percentile taken as the high input limit (100 = maximum).
+
+    Returns:
+        np.ndarray: (C, 256) uint8 tables; values beyond the limits saturate.
+    """
+    cdf = np.cumsum(hist, axis=1)
+    total = cdf[:, -1:]
+    # Smallest value with more than low_pct (at least high_pct) of the pixels at or below it
+    lows = (cdf > total * (low_pct / 100)).argmax(axis=1)
+    highs = (cdf >= total * (high_pct / 100)).argmax(axis=1)
+    return np.stack([contrast_lut(lo, hi, min_out, max_out) for lo, hi in zip(lows, highs)])
+
+
+def equalize_luts(hist: np.ndarray, min_out: int = 0, max_out: int = 255) -> np.ndarray:
+    """Builds histogram equalization tables (output spread by the cumulative histogram).
+
+    Args:
+        hist: (C, 256) channel histograms.
+        min_out: Output value of the lowest input value present.
+        max_out: Output value of the highest input value present.
+
+    Returns:
+        np.ndarray: (C, 256) uint8 tables (identity for a constant channel).
+    """
+    cdf = np.cumsum(hist, axis=1)
+    cdf_min = cdf[np.arange(len(cdf)), (hist > 0).argmax(axis=1)][:, np.newaxis]
+    span = cdf[:, -1:] - cdf_min
+    levels = (cdf - cdf_min) * ((max_out - min_out) / np.maximum(span, 1)) + min_out
+    luts = np.clip(np.rint(levels), min_out, max_out).astype(np.uint8)
+    luts[span[:, 0] == 0] = IDENTITY_LUT
+    return luts
+
+
+def contrast_luts(hist: np.ndarray, mode: str = 'minmax', min_out: int = 0, max_out: int = 255,
+                  low_pct: float = 1.0, high_pct: float = 99.0) -> np.ndarray:
+    """Builds the per-channel tables for a contrast mode from channel histograms.
+
+    Args:
+        hist: (C, 256) channel histograms.
+        mode: 'minmax', 'percentile' or 'equalize'.
+        min_out: Minimum output value.
+        max_out: Maximum output value.
+        low_pct: Low percentile for 'percentile'.
+        high_pct: High percentile for 'percentile'.
+
+    Returns:
+        np.ndarray: (C, 256) uint8 tables.
+    """
+    if mode == 'minmax':
+        return stretch_luts(hist, min_out, max_out)
+    if mode == 'percentile':
+        return stretch_luts(hist, min_out, max_out, low_pct, high_pct)
+    if mode == 'equalize':
+        return equalize_luts(hist, min_out, max_out)
+    raise ValueError(f"Invalid mode. Use one of: {', '.join(CONTRAST_MODES)}.")
+
+
+def _percentile_limits(image: np.ndarray, low_pct: float, high_pct: float) -> tuple:
+    """The stretch limits stretch_luts reads off the histogram, as order statistics of any dtype."""
+    values = image.ravel()
+    total = values.size
+    # Smallest value with more than low_pct (at least high_pct) of the pixels at or below it
+    low = min(int(total * (low_pct / 100)), total - 1)
+    high = min(max(int(np.ceil(total * (high_pct / 100))) - 1, 0), total - 1)
+    ordered = np.partition(values, (low, high))
+    return ordered[low], ordered[high]
+
+
+def _equalize_values(image: np.ndarray, min_out: int, max_out: int, out: np.ndarray) -> np.ndarray:
+    """Histogram equalization of a single-channel image of any dtype, one bin per distinct value."""
+    values, inverse, counts = np.unique(image, return_inverse=True, return_counts=True)
+    cdf = np.cumsum(counts)
+    span = max(cdf[-1] - cdf[0], 1)
+    levels = np.clip(np.rint((cdf - cdf[0]) * ((max_out - min_out) / span) + min_out), min_out, max_out)
+    if len(values) == 1:  # Constant image: left as is, like the uint8 identity table
+        levels = np.clip(values, 0, 255)
+    out = prepare_out(out, image.shape, np.uint8)
+    np.copyto(out, levels.astype(np.uint8)[inverse.reshape(image.shape)], casting='unsafe')
+    return out
+
+
+def adjust_contrast(image: np.ndarray, min_out: int = 0, max_out: int = 255, *, mode: str = 'minmax',
+                    low_pct: float = 1.0, high_pct: float = 99.0, out: np.ndarray = None) -> np.ndarray:
+    """Adjusts contrast to [min_out, max_out] per channel.
 
-def adjust_contrast(image: np.ndarray, min_out: int = 0, max_out: int = 255) -> np.ndarray:
-    """Performs linear contrast stretching to [min_out, max_out].
-    
     Args:
         image: Input image (2D grayscale or 3D RGB).
         min_out: Minimum output value.
         max_out: Maximum output value.
-    
+        mode: 'minmax' (linear stretch of the full range), 'percentile' (linear
+            stretch of [low_pct, high_pct], saturating the tails) or 'equalize'
+            (histogram equalization). uint8 images use channel histograms;
+            other dtypes are sorted per channel instead.
+        low_pct: Low percentile for 'percentile'.
+        high_pct: High percentile for 'percentile'.
+        out: Optional preallocated uint8 output; may be the input itself.
+
+    mode, low_pct, high_pct and out are keyword-only.
+
     Returns:
-        np.ndarray: Contrast-stretched image.
+        np.ndarray: Contrast-adjusted image.
     """
-    if image.ndim == 3:  # RGB
-        return np.stack([
-            adjust_contrast(image[..., c], min_out, max_out)
-            for c in range(image.shape[2])
-        ], axis=2)
-    
-    min_in, max_in = image.min(), image.max()
+    if image.dtype == np.uint8:  # One histogram pass, then one table gather
+        luts = contrast_luts(channel_histograms(image), mode, min_out, max_out, low_pct, high_pct)
+        return apply_lut(image, luts if image.ndim == 3 else luts[0], out=out)
+
+    if mode not in CONTRAST_MODES:
+        raise ValueError(f"Invalid mode. Use one of: {', '.join(CONTRAST_MODES)}.")
+
+    if image.ndim == 3:  # RGB: each channel is stretched straight into its plane of out
+        out = prepare_out(out, image.shape, np.uint8)
+        for c in range(image.shape[2]):
+            adjust_contrast(image[..., c], min_out, max_out, mode=mode, low_pct=low_pct,
+                            high_pct=high_pct, out=out[..., c])
+        return out
+
+    if mode == 'equalize':
+        return _equalize_values(image, min_out, max_out, out)
+    if mode == 'percentile':
+        min_in, max_in = _percentile_limits(image, low_pct, high_pct)
+    else:
+        min_in, max_in = image.min(), image.max()
     if min_in == max_in:  # Avoid division by zero
-        return image
-    
-    stretched = (image - min_in) * ((max_out - min_out) / (max_in - min_in)) + min_out
-    return np.clip(stretched, min_out, max_out).astype(np.uint8)
\ No newline at end of file
+        if out is None:
+            return image
+        np.copyto(out, image, casting='unsafe')
+        return out
+
+    stretched = scratch('contrast.stretched', image.shape, np.result_type(image.dtype, np.float32))
+    # Float limits: values below a percentile limit must not wrap around in an integer dtype
+    np.subtract(image, stretched.dtype.type(min_in), out=stretched)
+    stretched *= (max_out - min_out) / (float(max_in) - float(min_in))
+    stretched += min_out
+    np.clip(stretched, min_out, max_out, out=stretched)
+    out = prepare_out(out, image.shape, np.uint8)
+    np.copyto(out, stretched, casting='unsafe')
+    return out
@@ -0,0 +1,186 @@
+import numpy as np
+from buffers import scratch, prepare_out
+
+# Kernels with at most this many taps always use the direct path; above it the
+# FFT path is chosen once its estimated cost drops below the direct one.
+DIRECT_MAX_TAPS = 49
+FFT_COST_FACTOR = 3.0
+
+
+def _fast_length(n: int) -> int:
+    """Returns the smallest 2-3-5 smooth integer >= n (fast FFT size)."""
+    best = 1 << max(0, (n - 1).bit_length())
+    p5 = 1
+    while p5 < best:
+        p35 = p5
+        while p35 < best:
+            p235 = p35
+            while p235 < n:
+                p235 *= 2
+            best = min(best, p235)
+            p35 *= 3
+        p5 *= 5
+    return best
+
+
+def pad_reflect(image: np.ndarray, pad_h: int, pad_w: int, out: np.ndarray = None) -> np.ndarray:
+    """
+    Reflect-pads the two spatial axes, leaving any channel axis untouched.
+
+    Args:
+        image (np.ndarray): 2D image or 3D image with channels last.
+        pad_h (int): Rows added above and below.
+        pad_w (int): Columns added left and right.
+        out (np.ndarray): Optional preallocated padded array (any dtype the
+            image casts to), filled without temporaries.
+
+    Returns:
+        np.ndarray: Padded image.
+    """
+    height, width = image.shape[:2]
+    if out is None or pad_h >= height or pad_w >= width:
+        pad = [(pad_h, pad_h), (pad_w, pad_w)] + [(0, 0)] * (image.ndim - 2)
+        padded = np.pad(image, pad, mode='reflect')
+        if out is None:
+            return padded
+        out[...] = padded
+        return out
+
+    out[pad_h:pad_h + height, pad_w:pad_w + width] = image
+    # Mirror rows, then columns over the full height (which fills the corners)
+    for k in range(1, pad_h + 1):
+        out[pad_h - k] = out[pad_h + k]
+        out[pad_h + height - 1 + k] = out[pad_h + height - 1 - k]
+    for k in range(1, pad_w + 1):
+        out[:, pad_w - k] = out[:, pad_w + k]
+        out[:, pad_w + width - 1 + k] = out[:, pad_w + width - 1 - k]
+    return out
+
+
+def _convolve_direct(padded: np.ndarray, kernel: np.ndarray, out: np.ndarray) -> np.ndarray:
+    """
+    Shifted-slice accumulation: one multiply-add over the whole image per kernel tap.
+
+    Args:
+        padded (np.ndarray): Reflect-padded float32 image (H x W or H x W x C).
+        kernel (np.ndarray): Already flipped 2D kernel.
+        out (np.ndarray): float32 output of the image's shape.
+
+    Returns:
+        np.ndarray: Convolved image (out).
+    """
+    height, width = out.shape[:2]
+    out.fill(0)
+    tmp = scratch('convolve2d.tmp', out.shape)
+
+    for a in range(kernel.shape[0]):
+        for b in range(kernel.shape[1]):
+            weight = kernel[a, b]
+            if weight == 0:
+                continue
+            region = padded[a:a + height, b:b + width]
+            np.multiply(region, weight, out=tmp)
+            out += tmp
+
+    return out
+
+
+def _convolve_fft(padded: np.ndarray, kernel: np.ndarray, out: np.ndarray) -> np.ndarray:
+    """
+    FFT convolution of the padded image; only the alias-free (valid) part is kept.
+
+    The spectra are temporaries of the FFT size; only the result goes to out.
+
+    Args:
+        padded (np.ndarray): Reflect-padded float32 image (H x W or H x W x C).
+        kernel (np.ndarray): Original (unflipped) 2D kernel.
+        out (np.ndarray): float32 output of the image's shape.
+
+    Returns:
+        np.ndarray: Convolved image (out).
+    """
+    height, width = out.shape[:2]
+    kernel_height, kernel_width = kernel.shape
+    fft_shape = (_fast_length(padded.shape[0]), _fast_length(padded.shape[1]))
+
+    # Broadcast the kernel spectrum over the channel axis, if any
+    kernel_spectrum = np.fft.rfft2(kernel.astype(np.float64), s=fft_shape)
+    if padded.ndim == 3:
+        kernel_spectrum = kernel_spectrum[:, :, np.newaxis]
+
+    image_spectrum = np.fft.rfft2(padded, s=fft_shape, axes=(0, 1))
+    image_spectrum *= kernel_spectrum
+    full = np.fft.irfft2(image_spectrum, s=fft_shape, axes=(0, 1))
+
+    # Linear convolution index (i + kh - 1) corresponds to output pixel i
+    valid = full[kernel_height - 1:kernel_height - 1 + height,
+                 kernel_width - 1:kernel_width - 1 + width]
+    np.copyto(out, valid, casting='same_kind')
+    return out
+
+
+def choose_method(image_shape: tuple, kernel_shape: tuple) -> str:
+    """
+    Picks the cheaper convolution path for the given image and kernel sizes.
+
+    Args:
+        image_shape (tuple): Shape of the image (H x W or H x W x C).
+        kernel_shape (tuple): Shape of the 2D kernel.
+
+    Returns:
+        str: 'direct' or 'fft'.
+    """
+    taps = kernel_shape[0] * kernel_shape[1]
+    if taps <= DIRECT_MAX_TAPS:
+        return 'direct'
+
+    padded_h = image_shape[0] + 2 * (kernel_shape[0] // 2)
+    padded_w = image_shape[1] + 2 * (kernel_shape[1] // 2)
+    fft_size = _fast_length(padded_h) * _fast_length(padded_w)
+
+    # Direct costs one pass per tap; FFT costs a few passes per log2 of its size
+    direct_cost = taps * image_shape[0] * image_shape[1]
+    fft_cost = FFT_COST_FACTOR * fft_size * np.log2(fft_size)
+    return 'fft' if fft_cost < direct_cost else 'direct'
+
+
+def convolve2d(image: np.ndarray, kernel: np.ndarray, method: str = 'auto',
+               out: np.ndarray = None) -> np.ndarray:
+    """
+    Applies a 2D convolution with reflect padding to a single- or multi-channel image.
+
+    Multi-channel images (H x W x C) are convolved per channel in one call; the
+    output has the same spatial size as the input. The padded copy lives in
+    reusable scratch space, so the direct path allocates nothing per call when
+    out is given.
+
+    Args:
+        image (np.ndarray): 2D image or 3D image with channels last.
+        kernel (np.ndarray): 2D kernel array.
+        method (str): 'direct', 'fft' or 'auto' (chosen by kernel and image size).
+        out (np.ndarray): Optional preallocated float32 output (may be the
+            input itself if it is float32).
+
+    Returns:
+        np.ndarray: Convolved image (float32).
+    """
+    if image.ndim not in (2, 3):
+        raise ValueError("Unsupported image dimensions. Expected 2D or 3D array.")
+    if kernel.ndim != 2:
+        raise ValueError("Kernel must be a 2D array.")
+
+    if method == 'auto':
+        method = choose_method(image.shape, kernel.shape)
+
+    if method not in ('direct', 'fft'):
+        raise ValueError("Invalid method. Use 'auto', 'direct' or 'fft'.")
+
+    pad_h, pad_w = kernel.shape[0] // 2, kernel.shape[1] // 2
+    padded_shape = (image.shape[0] + 2 * pad_h, image.shape[1] + 2 * pad_w) + image.shape[2:]
+    padded = pad_reflect(image, pad_h, pad_w, out=scratch('convolve2d.padded', padded_shape))
+    out = prepare_out(out, image.shape, np.float32)
+
+    if method == 'direct':
+        flipped = np.flipud(np.fliplr(kernel)).astype(np.float32)
+        return _convolve_direct(padded, flipped, out)
+    return _convolve_fft(padded, kernel, out)
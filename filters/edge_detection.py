@@ -1,37 +1,132 @@
 import numpy as np
 from grayscale import grayscale
-def sobel_edge_detection(image: np.ndarray) -> np.ndarray:
+from parallel import run_threaded
+from convolution import pad_reflect
+from buffers import scratch, prepare_out
+
+
+def _sobel_into(image: np.ndarray, gx: np.ndarray, gy: np.ndarray, magnitude: np.ndarray) -> None:
     """
-    Applies Sobel edge detection to a grayscale image.
+    Writes the Sobel gradients and magnitude of a 2D image into float32 buffers.
+
+    The 3x3 Sobel operators are separable: Gx = [1,2,1]^T x [-1,0,1] and
+    Gy = [-1,0,1]^T x [1,2,1], so each is a vertical 3-tap pass followed by a
+    horizontal 3-tap pass over shifted slices of the same padded buffer. The
+    padded copy and the vertical passes live in reusable scratch space.
+    """
+    height, width = image.shape
+    padded = pad_reflect(image, 1, 1, out=scratch('sobel.padded', (height + 2, width + 2)))
+
+    # Vertical passes: smoothing [1, 2, 1] and difference [-1, 0, 1]
+    top, middle, bottom = padded[:-2], padded[1:-1], padded[2:]
+    smooth = np.multiply(middle, 2, out=scratch('sobel.smooth', middle.shape))
+    smooth += top
+    smooth += bottom
+    diff = np.subtract(bottom, top, out=scratch('sobel.diff', middle.shape))
+
+    # Horizontal passes: difference on the smoothed rows, smoothing on the differences
+    np.subtract(smooth[:, 2:], smooth[:, :-2], out=gx)
+    np.multiply(diff[:, 1:-1], 2, out=gy)
+    gy += diff[:, :-2]
+    gy += diff[:, 2:]
+
+    np.hypot(gx, gy, out=magnitude)
+
+
+def sobel_gradients(image: np.ndarray) -> tuple:
+    """
+    Computes the Sobel gradients Gx, Gy and their magnitude in one pass.
 
     Args:
         image (np.ndarray): 2D grayscale image.
 
     Returns:
-        np.ndarray: Edge-detected image as 8-bit grayscale.
+        tuple: (gx, gy, magnitude) as float32 arrays of the image size.
     """
-    if  image.ndim !=2:
-        image = grayscale(image)
+    gx, gy, magnitude = (np.empty(image.shape, dtype=np.float32) for _ in range(3))
+    _sobel_into(image, gx, gy, magnitude)
+    return gx, gy, magnitude
 
-    Gx = np.array([[-1, 0, 1],
-                   [-2, 0, 2],
-                   [-1, 0, 1]])
-    Gy = np.array([[-1, -2, -1],
-                   [ 0,  0,  0],
-                   [ 1,  2,  1]])
 
-    image = image.astype(np.float32)
-    height, width = image.shape
-    padded = np.pad(image, ((1, 1), (1, 1)), mode='reflect')  
+def normalize_magnitude(edges: np.ndarray, peak: float, out: np.ndarray = None) -> np.ndarray:
+    """
+    Scales a gradient magnitude so that peak maps to 255.
+
+    Args:
+        edges (np.ndarray): float32 magnitude (scaled and clipped in place).
+        peak (float): Maximum magnitude over the whole image.
+        out (np.ndarray): Optional preallocated uint8 output.
+
+    Returns:
+        np.ndarray: 8-bit edge image.
+    """
+    if peak > 0:
+        edges *= 255 / peak
+    np.clip(edges, 0, 255, out=edges)
+    out = prepare_out(out, edges.shape, np.uint8)
+    np.copyto(out, edges, casting='unsafe')
+    return out
+
+
+def _sobel_magnitude(image: np.ndarray) -> np.ndarray:
+    """Raw Sobel magnitude of a grayscale block (thread work unit)."""
+    return sobel_gradients(image)[2]
+
+
+def _sobel_magnitude_direction(image: np.ndarray) -> np.ndarray:
+    """Raw Sobel magnitude and direction of a grayscale block, stacked on a last axis (thread work unit)."""
+    gx, gy, magnitude = sobel_gradients(image)
+    return np.stack((magnitude, np.arctan2(gy, gx)), axis=-1)
+
+
+def sobel_edge_detection(image: np.ndarray, return_direction: bool = False,
+                         normalize: bool = True, workers: int = 1, out: np.ndarray = None):
+    """
+    Applies Sobel edge detection to a grayscale image.
+
+    Args:
+        image (np.ndarray): 2D grayscale image (RGB input is converted first).
+        return_direction (bool): Also return the gradient direction in radians.
+        normalize (bool): Scale the magnitude to 8-bit [0, 255]; if False the raw
+            float32 magnitude is returned.
+        workers (int): Threads to split the rows across (bands with a 1-row halo).
+        out (np.ndarray): Optional preallocated output for the edges (uint8, or
+            float32 when normalize is False); may be a 2D input itself.
+
+    Returns:
+        np.ndarray: Edge-detected image as 8-bit grayscale (or float32 magnitude),
+            or a (edges, direction) tuple when return_direction is True.
+    """
+    if  image.ndim !=2:
+        image = grayscale(image, out=scratch('sobel.gray', image.shape[:2], np.uint8))
+
+    # The magnitude goes to scratch when it is normalized afterwards, else to out
+    if normalize:
+        edges = scratch('sobel.magnitude', image.shape)
+    else:
+        edges = prepare_out(out, image.shape, np.float32)
 
-    edges = np.zeros((height, width), dtype=np.float32)
+    if workers > 1:
+        if np.may_share_memory(edges, image):  # Bands read their neighbours' rows
+            edges = scratch('sobel.magnitude', image.shape)
+        if return_direction:  # One pass per band yields both, so gradients are computed once
+            both = run_threaded(_sobel_magnitude_direction, image, halo=1, workers=workers)
+            edges[...] = both[..., 0]
+            direction = np.ascontiguousarray(both[..., 1])
+        else:
+            run_threaded(_sobel_magnitude, image, halo=1, workers=workers, out=edges)
+            direction = None
+    else:
+        gx, gy = scratch('sobel.gx', image.shape), scratch('sobel.gy', image.shape)
+        _sobel_into(image, gx, gy, edges)
+        direction = np.arctan2(gy, gx) if return_direction else None
 
-    for i in range(height):
-        for j in range(width):
-            region = padded[i:i+3, j:j+3]
-            gx = np.sum(region * Gx)
-            gy = np.sum(region * Gy)
-            edges[i, j] = np.sqrt(gx**2 + gy**2)
+    if normalize:
+        edges = normalize_magnitude(edges, edges.max(), out=out)
+    elif out is not None and edges is not out:
+        np.copyto(out, edges)
+        edges = out
 
-    edges = np.clip((edges / edges.max()) * 255, 0, 255)
-    return edges.astype(np.uint8)
+    if return_direction:
+        return edges, direction
+    return edges
@@ -0,0 +1,206 @@
+import math
+import numpy as np
+from convolution import convolve2d
+from buffers import scratch, prepare_out
+
+# Gaussian blur two ways:
+# - 'exact': the sampled Gaussian applied as two 1D passes (rows, then
+#   columns) through the convolution engine. Cost grows with the kernel
+#   length (about 6 sigma), so it is meant for small sigma.
+# - 'box': a few successive box blurs whose combined variance equals sigma^2
+#   (repeated box filtering converges to a Gaussian). A box blur is the mean
+#   over a window taken from prefix sums (the summed-area table, one axis at a
+#   time), so each pass costs a few operations per pixel whatever the radius.
+# Both reflect-pad at the border and handle multi-channel images in one call.
+
+BLUR_METHODS = ('auto', 'exact', 'box')
+EXACT_MAX_SIGMA = 3.0  # 'auto' switches to the box approximation above this
+TRUNCATE = 3.0         # Exact kernel radius in sigmas
+BOX_PASSES = 3
+
+# Values per block of lines; all box passes along one axis run on a block
+# while it is in cache
+_BLOCK_VALUES = 1 << 18
+
+
+def gaussian_kernel(sigma: float, truncate: float = TRUNCATE) -> np.ndarray:
+    """
+    Samples a normalized 1D Gaussian.
+
+    Args:
+        sigma (float): Standard deviation in pixels.
+        truncate (float): Kernel radius in standard deviations.
+
+    Returns:
+        np.ndarray: float32 kernel of odd length 2 * ceil(truncate * sigma) + 1.
+    """
+    radius = max(1, math.ceil(truncate * sigma))
+    x = np.arange(-radius, radius + 1, dtype=np.float64)
+    kernel = np.exp(-0.5 * (x / sigma) ** 2)
+    return (kernel / kernel.sum()).astype(np.float32)
+
+
+def box_radii(sigma: float, passes: int = BOX_PASSES) -> list:
+    """
+    Chooses box radii whose successive application approximates a Gaussian.
+
+    Widths are the two odd integers around the ideal width, mixed so the
+    summed box variances ((w^2 - 1) / 12 each) come closest to sigma^2.
+
+    Args:
+        sigma (float): Standard deviation to approximate.
+        passes (int): Number of box blurs.
+
+    Returns:
+        list: One radius per pass (window width 2 * radius + 1).
+    """
+    ideal = math.sqrt(12 * sigma ** 2 / passes + 1)
+    lower = int(ideal)
+    if lower % 2 == 0:
+        lower -= 1
+    lower = max(lower, 1)
+    # Number of passes using the lower width
+    m = round((12 * sigma ** 2 - passes * lower ** 2 - 4 * passes * lower - 3 * passes) / (-4 * lower - 4))
+    m = min(max(m, 0), passes)
+    return [(lower - 1) // 2 if i < m else (lower + 1) // 2 for i in range(passes)]
+
+
+def _along(axis: int, index) -> tuple:
+    """Index tuple selecting `index` along `axis`."""
+    return (slice(None),) * axis + (index,)
+
+
+def _box_lines(block: np.ndarray, radii: list, axis: int) -> np.ndarray:
+    """
+    Box-filters a float32 block in place along one axis, once per radius.
+
+    Each pass writes the reflect-padded lines after a zero into float64 prefix
+    sums; window sums are then differences of two prefix sums.
+
+    Args:
+        block (np.ndarray): float32 block (2D or 3D); overwritten.
+        radii (list): Box radius of each pass.
+        axis (int): Axis to filter along (0 or 1).
+
+    Returns:
+        np.ndarray: The filtered block.
+    """
+    length = block.shape[axis]
+    for radius in radii:
+        if radius == 0:
+            continue
+        window = 2 * radius + 1
+        shape = block.shape[:axis] + (length + window,) + block.shape[axis + 1:]
+        sums = scratch('blur.sums', shape, np.float64)
+        sums[_along(axis, 0)] = 0
+        padded = sums[_along(axis, slice(1, None))]
+
+        if radius < length:
+            padded[_along(axis, slice(radius, radius + length))] = block
+            padded[_along(axis, slice(0, radius))] = block[_along(axis, slice(radius, 0, -1))]
+            right = block[_along(axis, slice(length - 1 - radius, length - 1))]
+            padded[_along(axis, slice(radius + length, None))] = right[_along(axis, slice(None, None, -1))]
+        else:  # Window wider than the image: repeated reflection
+            pad = [(0, 0)] * block.ndim
+            pad[axis] = (radius, radius)
+            padded[...] = np.pad(block, pad, mode='reflect' if length > 1 else 'edge')
+
+        np.cumsum(padded, axis=axis, out=padded)
+        np.subtract(sums[_along(axis, slice(window, None))], sums[_along(axis, slice(0, length))],
+                    out=block, casting='same_kind')
+        block *= 1 / window
+    return block
+
+
+def _box_passes(work: np.ndarray, radii: list) -> np.ndarray:
+    """Applies the box passes to a float32 image in place: rows by row blocks, then columns by column blocks."""
+    height, width = work.shape[:2]
+    line_values = work[0, 0].size  # Channels per pixel
+
+    block_rows = max(1, _BLOCK_VALUES // (width * line_values))
+    for start in range(0, height, block_rows):
+        _box_lines(work[start:start + block_rows], radii, axis=1)
+
+    block_cols = max(1, _BLOCK_VALUES // (height * line_values))
+    for start in range(0, width, block_cols):
+        # Column blocks are filtered in a contiguous copy (row-vector prefix sums)
+        block = scratch('blur.columns', work[:, start:start + block_cols].shape)
+        block[...] = work[:, start:start + block_cols]
+        work[:, start:start + block_cols] = _box_lines(block, radii, axis=0)
+    return work
+
+
+def _finish(work: np.ndarray, out: np.ndarray) -> np.ndarray:
+    """Rounds the float32 result into a uint8 output."""
+    np.rint(work, out=work)
+    np.clip(work, 0, 255, out=work)
+    out = prepare_out(out, work.shape, np.uint8)
+    np.copyto(out, work, casting='unsafe')
+    return out
+
+
+def box_blur(image: np.ndarray, radius: int, out: np.ndarray = None) -> np.ndarray:
+    """
+    Replaces each pixel by the mean of its (2 * radius + 1)^2 window.
+
+    Cost per pixel does not depend on the radius.
+
+    Args:
+        image (np.ndarray): Input image (2D grayscale or 3D with channels last).
+        radius (int): Window radius in pixels.
+        out (np.ndarray): Optional preallocated uint8 output; may be the input
+            itself (in-place).
+
+    Returns:
+        np.ndarray: Blurred uint8 image.
+    """
+    if image.ndim not in (2, 3):
+        raise ValueError("Unsupported image dimensions. Expected 2D or 3D array.")
+    if radius < 0:
+        raise ValueError("radius must be non-negative.")
+
+    work = scratch('blur.work', image.shape)
+    work[...] = image
+    return _finish(_box_passes(work, [int(radius)]), out)
+
+
+def gaussian_blur(image: np.ndarray, sigma: float, method: str = 'auto',
+                  out: np.ndarray = None) -> np.ndarray:
+    """
+    Applies a Gaussian blur.
+
+    Args:
+        image (np.ndarray): Input image (2D grayscale or 3D with channels last).
+        sigma (float): Standard deviation in pixels.
+        method (str): 'exact' (separable sampled kernel, cost grows with
+            sigma), 'box' (iterated box approximation, cost independent of
+            sigma) or 'auto' (exact up to EXACT_MAX_SIGMA, box above).
+        out (np.ndarray): Optional preallocated uint8 output; may be the input
+            itself (in-place).
+
+    Returns:
+        np.ndarray: Blurred uint8 image.
+    """
+    if image.ndim not in (2, 3):
+        raise ValueError("Unsupported image dimensions. Expected 2D or 3D array.")
+    if sigma < 0:
+        raise ValueError("sigma must be non-negative.")
+    if method == 'auto':
+        method = 'exact' if sigma <= EXACT_MAX_SIGMA else 'box'
+    if method not in ('exact', 'box'):
+        raise ValueError(f"Invalid method. Use one of: {', '.join(BLUR_METHODS)}.")
+
+    work = scratch('blur.work', image.shape)
+    work[...] = image
+    if sigma == 0:
+        return _finish(work, out)
+
+    if method == 'box':
+        return _finish(_box_passes(work, box_radii(sigma)), out)
+
+    # Rows, then columns; the engine pads into its own scratch, so it can
+    # write each pass back into work
+    kernel = gaussian_kernel(sigma)
+    convolve2d(work, kernel[np.newaxis, :], out=work)
+    convolve2d(work, kernel[:, np.newaxis], out=work)
+    return _finish(work, out)
@@ -0,0 +1,173 @@
+import json
+import time
+import tracemalloc
+from contextlib import nullcontext
+from functools import wraps
+
+# Per-stage timing and memory instrumentation. Stages are opened with
+# `with stage("name"):` or the @instrumented("name") decorator. While
+# instrumentation is disabled (the default) stage() returns one shared no-op
+# context manager, so the cost is a flag check per stage.
+
+_enabled = False
+_trace_memory = False
+_records = []
+_stack = []
+_NULL_STAGE = nullcontext()
+
+
+def enable(trace_memory: bool = True) -> None:
+    """
+    Starts recording stages.
+
+    Args:
+        trace_memory (bool): Also record allocated/peak memory via tracemalloc
+            (slows down allocation-heavy code while active).
+    """
+    global _enabled, _trace_memory
+    _enabled = True
+    _trace_memory = trace_memory
+    if trace_memory and not tracemalloc.is_tracing():
+        tracemalloc.start()
+
+
+def disable() -> None:
+    """Stops recording stages (records are kept until reset)."""
+    global _enabled, _trace_memory
+    if _trace_memory and tracemalloc.is_tracing():
+        tracemalloc.stop()
+    _enabled = False
+    _trace_memory = False
+
+
+def is_enabled() -> bool:
+    """Returns whether stages are being recorded."""
+    return _enabled
+
+
+def reset() -> None:
+    """Discards all recorded stages."""
+    _records.clear()
+
+
+def get_records() -> list:
+    """Returns a copy of the recorded stages, in completion order."""
+    return [dict(r) for r in _records]
+
+
+class _Stage:
+    """Context manager recording one stage (only created while enabled)."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.peak_seen = 0
+
+    def __enter__(self):
+        if _trace_memory:
+            current, peak = tracemalloc.get_traced_memory()
+            if _stack:  # Keep the parent's peak before resetting it for this stage
+                _stack[-1].peak_seen = max(_stack[-1].peak_seen, peak)
+            tracemalloc.reset_peak()
+            self.mem_start = current
+        self.depth = len(_stack)
+        _stack.append(self)
+        self.cpu_start = time.process_time()
+        self.wall_start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        wall = time.perf_counter() - self.wall_start
+        cpu = time.process_time() - self.cpu_start
+        _stack.pop()
+
+        record = {
+            'stage': self.name,
+            'depth': self.depth,
+            'wall_s': wall,
+            'cpu_s': cpu,
+            'failed': exc_type is not None,
+        }
+        if _trace_memory:
+            current, peak = tracemalloc.get_traced_memory()
+            peak = max(self.peak_seen, peak)
+            if _stack:
+                _stack[-1].peak_seen = max(_stack[-1].peak_seen, peak)
+            record['allocated_mb'] = (current - self.mem_start) / 1e6
+            record['peak_mb'] = (peak - self.mem_start) / 1e6
+        _records.append(record)
+        return False
+
+
+def stage(name: str):
+    """
+    Returns a context manager that records one stage while enabled.
+
+    Example:
+        with stage("load"):
+            img = imageio.imread(path)
+    """
+    if not _enabled:
+        return _NULL_STAGE
+    return _Stage(name)
+
+
+def instrumented(name: str = None):
+    """Decorator recording every call of a function as a stage (default: its name)."""
+    def decorator(func):
+        stage_name = name or func.__name__
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            with _Stage(stage_name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def run_stage(name: str, func, *args, **kwargs):
+    """Calls func(*args, **kwargs) as a stage; arguments are evaluated before timing starts."""
+    if not _enabled:
+        return func(*args, **kwargs)
+    with _Stage(name):
+        return func(*args, **kwargs)
+
+
+def summary() -> dict:
+    """
+    Aggregates the records by stage name.
+
+    Returns:
+        dict: {stage: {'calls', 'wall_s', 'cpu_s'[, 'peak_mb']}} with times summed
+            and peak memory maximised over calls.
+    """
+    totals = {}
+    for r in _records:
+        entry = totals.setdefault(r['stage'], {'calls': 0, 'wall_s': 0.0, 'cpu_s': 0.0})
+        entry['calls'] += 1
+        entry['wall_s'] += r['wall_s']
+        entry['cpu_s'] += r['cpu_s']
+        if 'peak_mb' in r:
+            entry['peak_mb'] = max(entry.get('peak_mb', 0.0), r['peak_mb'])
+    return totals
+
+
+def print_summary() -> None:
+    """Prints the per-stage summary as a table."""
+    totals = summary()
+    if not totals:
+        return
+    print("\n" + "=" * 64)
+    print(f"{'Stage':<28}{'Calls':>6}{'Wall (s)':>10}{'CPU (s)':>10}{'Peak (MB)':>10}")
+    print("-" * 64)
+    for name, t in sorted(totals.items(), key=lambda item: -item[1]['wall_s']):
+        peak = f"{t['peak_mb']:.1f}" if 'peak_mb' in t else "-"
+        print(f"{name:<28}{t['calls']:>6}{t['wall_s']:>10.3f}{t['cpu_s']:>10.3f}{peak:>10}")
+    print("=" * 64)
+
+
+def write_trace(path: str) -> None:
+    """Writes all records and the summary as JSON."""
+    with open(path, 'w') as f:
+        json.dump({'records': get_records(), 'summary': summary()}, f, indent=2)
@@ -1,21 +1,25 @@
+import os
+import sys
+import instrumentation
+from instrumentation import run_stage
+from buffers import release_scratch
+from cache import content_key, run_chain
+from preview import build_preview, run_preview
 from audio_filters import fft_filter
 from utils import (
     load_audio,
     plot_audio_frequency,
     plot_audio_comparison,
+    plot_spectrogram,
     get_image_input,
-    resize_interactive,
+    get_resize_params,
     get_float_input,
     get_contrast_params,
+    get_clahe_params,
+    stream_filter_interactive,
     show_comparison,
     save_output
 )
-from grayscale import grayscale
-from edge_detection import sobel_edge_detection
-from horizontal_flip import horizontal_flip
-from sharpen import sharpen
-from brightness import adjust_brightness
-from contrast import adjust_contrast
 
 def show_menu():
     """Displays the main processing menu"""
@@ -38,7 +42,10 @@ def show_image_menu():
     print("5. Sharpen")
     print("6. Brightness")
     print("7. Contrast")
-    print("8. Back to Main Menu")
+    print("8. Adaptive Contrast (CLAHE)")
+    print("9. Gaussian Blur")
+    print("10. Saturation")
+    print("11. Back to Main Menu")
 
 def show_audio_menu():
     """Displays audio filter options"""
@@ -47,7 +54,9 @@ def show_audio_menu():
     print("="*40)
     print("1. Low-Pass Filter")
     print("2. High-Pass Filter")
-    print("3. Back to Main Menu")
+    print("3. Streaming Filter (FIR / Biquad)")
+    print("4. Spectrogram")
+    print("5. Back to Main Menu")
 
 
 def process_image():
@@ -55,51 +64,82 @@ def process_image():
     img = get_image_input()
     if img is None:
         return
+    # Results are cached by content, so repeating a filter (or running edge
+    # detection after grayscale, which it starts with) reuses earlier work
+    img_key = content_key(img)
+    gray = [('grayscale', {})] if img.ndim == 3 else []
+    # Filters are previewed on the pyramid level matching the display; the
+    # full-resolution chain only runs when the result is saved
+    preview = run_stage("preview_pyramid", build_preview, img, img_key)
     
     while True:
         show_image_menu()
-        choice = input("Select filter (1-8): ").strip()
+        choice = input("Select filter (1-11): ").strip()
         
-        if choice == '8':
+        if choice == '11':
             break
             
+        # Each entry builds the registry filter chain for the choice
         filters = {
-            '1': ('Grayscale', lambda: grayscale(img)),
-            '2': ('Edge Detection', lambda: sobel_edge_detection(img)),
-            '3': ('Horizontal Flip', lambda: horizontal_flip(img)),
-            '4': ('Resize', lambda: resize_interactive(img)),
-            '5': ('Sharpen', lambda: sharpen(img)),
-            '6': ('Brightness', lambda: adjust_brightness(img, get_float_input("Brightness factor (0.1-3.0): ", 0.1, 3.0))),
-            '7': ('Contrast', lambda: adjust_contrast(img, *get_contrast_params()))
+            '1': ('Grayscale', lambda: gray),
+            '2': ('Edge Detection', lambda: gray + [('edge_detection', {})]),
+            '3': ('Horizontal Flip', lambda: [('horizontal_flip', {})]),
+            '4': ('Resize', lambda: [('resize', dict(zip(('new_height', 'new_width'), get_resize_params(img))))]),
+            '5': ('Sharpen', lambda: [('sharpen', {})]),
+            '6': ('Brightness', lambda: [('brightness', {'factor': get_float_input("Brightness factor (0.1-3.0): ", 0.1, 3.0)})]),
+            '7': ('Contrast', lambda: [('contrast', get_contrast_params())]),
+            '8': ('CLAHE', lambda: gray + [('clahe', get_clahe_params())]),
+            '9': ('Gaussian Blur', lambda: [('gaussian_blur', {'sigma': get_float_input("Sigma in pixels (0.5-50.0): ", 0.5, 50.0)})]),
+            '10': ('Saturation', lambda: [('saturation', {'factor': get_float_input("Saturation factor (0.0-3.0): ", 0.0, 3.0)})])
         }
         
         if choice in filters:
-            name, func = filters[choice]
-            result = func()
-            show_comparison(img, result, name)
-            save_output(result, f"filtered_{name.lower().replace(' ', '_')}.png")
+            name, make_chain = filters[choice]
+            try:
+                run_image_filter(img, img_key, preview, name, make_chain())
+            except ValueError as e:  # Unsupported input or parameters; keep the session
+                print(f"Image processing error: {str(e)}")
+            finally:
+                release_scratch()  # Menu choices rarely repeat a shape; don't hold the temporaries
         else:
             print("Invalid choice")
 
+def run_image_filter(img, img_key, preview, name, chain):
+    """Previews a filter chain and saves the full-resolution result on request"""
+    slug = name.lower().replace(' ', '_')
+    source, result = run_stage("filter:" + slug, run_preview, preview, chain)
+    if preview['level'] == 0:  # Already full resolution
+        show_comparison(source, result, name)
+        save_output(result, f"filtered_{slug}.png")
+        return
+
+    show_comparison(source, result, f"{name} (preview)")
+    if input("Save full-resolution result? (y/n) [y]: ").strip().lower() != 'n':
+        result = run_stage("filter:" + slug + ":full", run_chain, img, chain, img_key)
+        save_output(result, f"filtered_{slug}.png")
+
 def process_audio():
     """Handles audio processing pipeline"""
     try:
         file_path = input("Enter audio file path: ").strip()
-        sample_rate, data = load_audio(file_path)
+        sample_rate, data = load_audio(file_path, mono=True)
         if sample_rate is None:
             return
             
         print(f"Loaded: {file_path} | Sample Rate: {sample_rate}Hz | Duration: {len(data)/sample_rate:.2f}s")
         
         # Show original frequency spectrum
-        plot_audio_frequency(data, sample_rate, "Original Frequency Spectrum")
+        spectrum = plot_audio_frequency(data, sample_rate, "Original Frequency Spectrum")
         
         while True:
             show_audio_menu()
-            choice = input("Select filter (1-3): ").strip()
+            choice = input("Select filter (1-5): ").strip()
             
-            if choice == '3':
+            if choice == '5':
                 break
+            if choice == '4':
+                plot_spectrogram(data, sample_rate, "Original Spectrogram")
+                continue
                 
             cutoff = get_float_input(
                 f"Enter cutoff frequency (max {sample_rate//2}Hz): ",
@@ -107,19 +147,22 @@ def process_audio():
             )
             
             if choice == '1':
-                filtered = fft_filter(data, sample_rate, cutoff, 'low')
+                filtered = run_stage("filter:fft_lowpass", fft_filter, data, sample_rate, cutoff, 'low')
                 save_path = "audio_lowpass.wav"
                 filter_type = "Low-Pass"
             elif choice == '2':
-                filtered = fft_filter(data, sample_rate, cutoff, 'high')
+                filtered = run_stage("filter:fft_highpass", fft_filter, data, sample_rate, cutoff, 'high')
                 save_path = "audio_highpass.wav"
                 filter_type = "High-Pass"
+            elif choice == '3':
+                filtered, filter_type = stream_filter_interactive(data, sample_rate, cutoff)
+                save_path = "audio_streamed.wav"
             else:
                 print("Invalid choice")
                 continue
             
             # Show comparison plots
-            plot_audio_comparison(data, filtered, sample_rate, cutoff, filter_type)
+            plot_audio_comparison(data, filtered, sample_rate, cutoff, filter_type, spectrum)
             
             # Save the result
             save_output((sample_rate, filtered), save_path, is_audio=True)
@@ -129,6 +172,22 @@ def process_audio():
 
 def main():
     """Main program loop"""
+    # FILTERS_PROFILE=1 prints a per-stage timing/memory summary on exit;
+    # FILTERS_PROFILE=trace.json also writes the full trace to that file
+    profile = os.environ.get("FILTERS_PROFILE")
+    if profile:
+        instrumentation.enable()
+    try:
+        menu_loop()
+    finally:
+        if profile:
+            instrumentation.print_summary()
+            if profile.lower().endswith('.json'):
+                instrumentation.write_trace(profile)
+                print(f"Trace written to {profile}")
+
+def menu_loop():
+    """Runs the main menu until the user exits"""
     while True:
         show_menu()
         choice = input("Select option (1-3): ").strip()
@@ -144,4 +203,7 @@ def main():
             print("Invalid choice")
 
 if __name__ == "__main__":
+    if len(sys.argv) > 1:  # Headless batch mode, e.g. main.py imgs/ -f grayscale -o out/
+        from batch import batch_main
+        sys.exit(batch_main(sys.argv[1:]))
     main()
\ No newline at end of file
@@ -0,0 +1,152 @@
+import numpy as np
+
+# For uint8 images every point operation (a function of the pixel value only)
+# is fully described by a 256-entry lookup table. Tables compose by indexing
+# one with another, so any chain of point operations collapses into a single
+# table applied with one gather over the image.
+
+IDENTITY_LUT = np.arange(256, dtype=np.uint8)
+IDENTITY_LUT.setflags(write=False)
+
+# Values gathered per block when writing into a caller-supplied buffer; the
+# block temporary stays small enough to be reused from the allocator's cache
+_BLOCK_VALUES = 1 << 16
+
+
+def brightness_lut(factor: float) -> np.ndarray:
+    """
+    Builds the table for brightness scaling (same arithmetic as adjust_brightness).
+
+    Args:
+        factor: Brightness multiplier (e.g., 1.0 = no change).
+
+    Returns:
+        np.ndarray: 256-entry uint8 lookup table.
+    """
+    values = np.arange(256, dtype=np.float32) * factor
+    return np.clip(values, 0, 255).astype(np.uint8)
+
+
+def contrast_lut(min_in: int, max_in: int, min_out: int = 0, max_out: int = 255) -> np.ndarray:
+    """
+    Builds the table for linear contrast stretching of [min_in, max_in] to [min_out, max_out].
+
+    Args:
+        min_in: Input value mapped to min_out.
+        max_in: Input value mapped to max_out.
+        min_out: Minimum output value.
+        max_out: Maximum output value.
+
+    Returns:
+        np.ndarray: 256-entry uint8 lookup table (identity if min_in == max_in).
+    """
+    min_in, max_in = int(min_in), int(max_in)
+    if min_in == max_in:  # Avoid division by zero
+        return IDENTITY_LUT.copy()
+
+    values = np.arange(256, dtype=np.float64)
+    stretched = (values - min_in) * ((max_out - min_out) / (max_in - min_in)) + min_out
+    return np.clip(stretched, min_out, max_out).astype(np.uint8)
+
+
+def gamma_lut(gamma: float) -> np.ndarray:
+    """
+    Builds the table for gamma correction: out = 255 * (in / 255) ** gamma.
+
+    Args:
+        gamma: Gamma exponent (< 1 brightens, > 1 darkens).
+
+    Returns:
+        np.ndarray: 256-entry uint8 lookup table.
+    """
+    if gamma <= 0:
+        raise ValueError("gamma must be positive.")
+    values = 255 * (np.arange(256, dtype=np.float64) / 255) ** gamma
+    return np.clip(np.rint(values), 0, 255).astype(np.uint8)
+
+
+def threshold_lut(threshold: int, low: int = 0, high: int = 255) -> np.ndarray:
+    """
+    Builds the table for binary thresholding: values >= threshold become high.
+
+    Args:
+        threshold: Threshold value.
+        low: Output for values below the threshold.
+        high: Output for values at or above the threshold.
+
+    Returns:
+        np.ndarray: 256-entry uint8 lookup table.
+    """
+    return np.where(np.arange(256) >= threshold, high, low).astype(np.uint8)
+
+
+def compose_luts(*luts: np.ndarray) -> np.ndarray:
+    """
+    Composes lookup tables into one, applied left to right.
+
+    Args:
+        *luts: 256-entry uint8 tables, or (C, 256) per-channel tables.
+
+    Returns:
+        np.ndarray: Table equivalent to applying each table in turn.
+    """
+    result = IDENTITY_LUT
+    for lut in luts:
+        if lut.ndim == 2 and result.ndim == 1:
+            result = np.broadcast_to(result, lut.shape)
+        # (C, 256) tables compose per channel: next[c, prev[c, v]]
+        result = np.take_along_axis(lut, result, axis=-1) if lut.ndim == 2 else lut[result]
+    return result.copy() if result is IDENTITY_LUT else result
+
+
+def apply_lut(image: np.ndarray, lut: np.ndarray, out: np.ndarray = None) -> np.ndarray:
+    """
+    Applies a lookup table to a uint8 image with a single gather.
+
+    Args:
+        image: uint8 image (2D or 3D).
+        lut: 256-entry uint8 table, or a (C, 256) table with one row per channel.
+        out: Optional preallocated uint8 output of the image's shape.
+
+    Returns:
+        np.ndarray: Mapped image.
+    """
+    if image.dtype != np.uint8:
+        raise ValueError("Lookup tables require a uint8 image.")
+
+    if lut.ndim == 2:
+        if image.ndim != 3 or image.shape[2] != lut.shape[0]:
+            raise ValueError("Per-channel table does not match the image channels.")
+        if out is None:
+            out = np.empty_like(image)
+        for c in range(image.shape[2]):
+            apply_lut(image[..., c], lut[c], out=out[..., c])
+        return out
+
+    if out is None:
+        return lut[image]
+
+    # Gather in row blocks so the index temporaries stay small
+    block_rows = max(1, _BLOCK_VALUES // max(1, image[0].size))
+    for start in range(0, image.shape[0], block_rows):
+        rows = slice(start, start + block_rows)
+        out[rows] = lut[image[rows]]
+    return out
+
+
+def apply_point_ops(image: np.ndarray, *luts: np.ndarray, out: np.ndarray = None) -> np.ndarray:
+    """
+    Fuses a chain of point operations into one table and applies it in one pass.
+
+    Example:
+        apply_point_ops(img, brightness_lut(1.2), contrast_lut(20, 230), gamma_lut(0.8))
+
+    Args:
+        image: uint8 image (2D or 3D).
+        *luts: Tables to apply, left to right.
+        out: Optional preallocated uint8 output of the image's shape.
+
+    Returns:
+        np.ndarray: Mapped image.
+    """
+    return apply_lut(image, compose_luts(*luts), out=out)
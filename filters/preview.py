@@ -0,0 +1,157 @@
+import numpy as np
+from buffers import scratch
+from registry import get_filter
+from cache import step_key, run_chain
+
+# Interactive previews. When an image is loaded, an image pyramid is built
+# once: level k is the image halved k times by 2x2 area averaging, down to
+# the first level that still covers the display. Filters run on that level
+# (a few megapixels at most, whatever the source size) for instant feedback,
+# and the full-resolution chain runs only when the result is saved. Filter
+# parameters measured in pixels (registered as pixel_params, e.g. a blur
+# sigma or a resize target) are scaled to the level, so the preview looks
+# like the full result shown at display size.
+
+# Pixels available to one image panel of show_comparison (rows, columns)
+DISPLAY_SIZE = (1000, 1000)
+
+# Output rows halved per block; keeps the uint16 sums in cache
+_BLOCK_ROWS = 256
+
+
+def pyramid_depth(shape: tuple, display_size: tuple = DISPLAY_SIZE) -> int:
+    """
+    Returns how often an image can be halved and still cover the display.
+
+    Args:
+        shape (tuple): Full-resolution image shape.
+        display_size (tuple): (rows, columns) the image is shown at.
+
+    Returns:
+        int: Index of the smallest pyramid level at least as large as the
+            image fitted into the display (0 = full resolution).
+    """
+    fit = min(display_size[0] / shape[0], display_size[1] / shape[1])
+    depth = 0
+    while fit * 2 ** (depth + 1) <= 1:
+        depth += 1
+    return depth
+
+
+def halve(image: np.ndarray) -> np.ndarray:
+    """
+    Halves an image by averaging 2x2 blocks (an odd last row or column is dropped).
+
+    uint8 images are summed in uint16 and rounded to nearest; other dtypes
+    are averaged in float64 and keep their dtype (resize would clip them to
+    uint8). An axis of length 1 is kept.
+
+    Args:
+        image (np.ndarray): 2D image or 3D image with channels last.
+
+    Returns:
+        np.ndarray: Image of half the size, of the input's dtype.
+    """
+    height, width = max(1, image.shape[0] // 2), max(1, image.shape[1] // 2)
+    if image.dtype != np.uint8 or min(image.shape[:2]) < 2:
+        fy, fx = (2 if n >= 2 else 1 for n in image.shape[:2])
+        blocks = image[:fy * height, :fx * width].reshape((height, fy, width, fx) + image.shape[2:])
+        mean = blocks.mean(axis=(1, 3))
+        if not np.issubdtype(image.dtype, np.floating):
+            np.rint(mean, out=mean)
+        return mean.astype(image.dtype)
+
+    out = np.empty((height, width) + image.shape[2:], dtype=np.uint8)
+    for start in range(0, height, _BLOCK_ROWS):
+        rows = image[2 * start:2 * min(start + _BLOCK_ROWS, height)]
+        top, bottom = rows[0::2, 0:2 * width], rows[1::2, 0:2 * width]
+        # dtype selects the uint16 loop; with only out= the add would wrap in uint8
+        acc = np.add(top[:, 0::2], bottom[:, 0::2], out=scratch('preview.acc', top[:, 0::2].shape, np.uint16),
+                     dtype=np.uint16)
+        acc += top[:, 1::2]
+        acc += bottom[:, 1::2]
+        acc += 2
+        acc >>= 2
+        np.copyto(out[start:start + _BLOCK_ROWS], acc, casting='unsafe')
+    return out
+
+
+def build_pyramid(image: np.ndarray, depth: int) -> list:
+    """
+    Builds the levels of an image pyramid.
+
+    Args:
+        image (np.ndarray): Full-resolution image (level 0, not copied).
+        depth (int): Number of halvings.
+
+    Returns:
+        list: depth + 1 images, each half the size of the previous one.
+    """
+    levels = [image]
+    for _ in range(depth):
+        levels.append(halve(levels[-1]))
+    return levels
+
+
+def scale_chain(chain: list, scale: float) -> list:
+    """
+    Scales the pixel-measured parameters of a filter chain.
+
+    Args:
+        chain (list): (filter name, params dict) steps.
+        scale (float): Size of the image the chain runs on relative to the
+            full-resolution image.
+
+    Returns:
+        list: Chain with pixel parameters scaled (integers stay integers,
+            at least 1 unless they were 0).
+    """
+    scaled = []
+    for name, params in chain:
+        params = dict(params)
+        for param in get_filter(name)['pixel_params']:
+            value = params.get(param)
+            if isinstance(value, (int, np.integer)) and value != 0:
+                params[param] = max(1, round(value * scale))
+            elif isinstance(value, float):
+                params[param] = value * scale
+        scaled.append((name, params))
+    return scaled
+
+
+def build_preview(image: np.ndarray, key: str, display_size: tuple = DISPLAY_SIZE) -> dict:
+    """
+    Builds the preview pyramid of a loaded image.
+
+    Args:
+        image (np.ndarray): Full-resolution image.
+        key (str): Content key of the image (see cache.content_key).
+        display_size (tuple): (rows, columns) the image is shown at.
+
+    Returns:
+        dict: 'levels' (pyramid images), 'keys' (cache key of each level) and
+            'level' (index of the level previews run on).
+    """
+    depth = pyramid_depth(image.shape, display_size)
+    levels = build_pyramid(image, depth)
+    # Levels are derived from the image, so their keys are too (no rehashing)
+    keys = [key] + [step_key(key, 'pyramid', {'level': k}) for k in range(1, depth + 1)]
+    return {'levels': levels, 'keys': keys, 'level': depth}
+
+
+def run_preview(preview: dict, chain: list) -> tuple:
+    """
+    Runs a filter chain on the preview level of the pyramid.
+
+    Args:
+        preview (dict): Result of build_preview.
+        chain (list): (filter name, params dict) steps, with parameters for
+            the full-resolution image.
+
+    Returns:
+        tuple: (preview source image, filtered preview); the filtered image is
+            the full result when the preview level is the full resolution.
+    """
+    level = preview['level']
+    source = preview['levels'][level]
+    return source, run_chain(source, scale_chain(chain, 0.5 ** level), preview['keys'][level])
@@ -0,0 +1,119 @@
+import numpy as np
+from grayscale import grayscale
+from edge_detection import sobel_edge_detection, normalize_magnitude
+from horizontal_flip import horizontal_flip
+from resize import resize
+from sharpen import sharpen
+from brightness import adjust_brightness
+from point_ops import apply_lut
+from contrast import adjust_contrast, channel_histograms, contrast_luts
+from clahe import clahe
+from gaussian_blur import gaussian_blur, box_blur
+from saturation import adjust_saturation
+
+# Central table of the image filters, used by the tiled, batch and parallel
+# runners. Each entry records how the filter may be split into pieces:
+#   func        - callable(image, **params) -> image
+#   halo        - neighbourhood radius in pixels a tile needs around itself
+#   tileable    - False for filters whose output pixel depends on a distant
+#                 input pixel (flips, resize)
+#   tile_dtypes - dtypes a tileable filter can be split for (None = any)
+#   prepare     - optional callable(source, tile_size, **params) -> dict of
+#                 extra params computed from a first pass over the whole input
+#   normalize   - output is a float magnitude scaled by its global maximum
+#   pixel_params - names of parameters measured in pixels, scaled when the
+#                 filter runs on a downscaled preview
+FILTERS = {}
+
+
+def register_filter(name: str, func, halo: int = 0, tileable: bool = True, tile_dtypes: tuple = None,
+                    prepare=None, normalize: bool = False, pixel_params: tuple = ()) -> None:
+    """
+    Registers an image filter under a name.
+
+    Args:
+        name (str): Filter name used by the runners.
+        func (callable): func(image, **params) -> filtered image.
+        halo (int): Neighbourhood radius the filter reads around each pixel.
+        tileable (bool): Whether the filter can be applied per tile.
+        tile_dtypes (tuple): Input dtypes the filter can be tiled for (None = any).
+        prepare (callable): Optional global first pass returning extra params.
+        normalize (bool): Output must be scaled to [0, 255] by its global maximum.
+        pixel_params (tuple): Parameters given in pixels (e.g. a blur radius).
+    """
+    FILTERS[name] = {
+        'func': func,
+        'halo': halo,
+        'tileable': tileable,
+        'tile_dtypes': None if tile_dtypes is None else tuple(np.dtype(t) for t in tile_dtypes),
+        'prepare': prepare,
+        'normalize': normalize,
+        'pixel_params': tuple(pixel_params),
+    }
+
+
+def get_filter(name: str) -> dict:
+    """Returns the registry entry for a filter name."""
+    if name not in FILTERS:
+        raise ValueError(f"Unknown filter '{name}'. Available: {', '.join(sorted(FILTERS))}")
+    return FILTERS[name]
+
+
+def apply_filter(image: np.ndarray, name: str, **params) -> np.ndarray:
+    """
+    Runs a registered filter on a whole in-memory image.
+
+    Args:
+        image (np.ndarray): Input image.
+        name (str): Registered filter name.
+        **params: Filter parameters.
+
+    Returns:
+        np.ndarray: Filtered image.
+    """
+    spec = get_filter(name)
+    if spec['prepare'] is not None:
+        params.update(spec['prepare'](image, max(1, image.shape[0]), **params))
+    result = spec['func'](image, **params)
+    if spec['normalize']:
+        result = normalize_magnitude(result, result.max())
+    return result
+
+
+'''Tile-friendly wrappers'''
+def _edge_magnitude(image: np.ndarray, workers: int = 1) -> np.ndarray:
+    """Unnormalized Sobel magnitude; normalized once the global maximum is known."""
+    return sobel_edge_detection(image, normalize=False, workers=workers)
+
+
+def _contrast_range(source, tile_size: int, min_out: int = 0, max_out: int = 255, mode: str = 'minmax',
+                    low_pct: float = 1.0, high_pct: float = 99.0) -> dict:
+    """First pass for contrast: channel histograms of the whole input, by row bands, turned into tables."""
+    if source.dtype != np.uint8:  # No histograms; _contrast_tile adjusts the whole image instead
+        return {}
+    hist = None
+    for start in range(0, source.shape[0], tile_size):
+        band_hist = channel_histograms(np.asarray(source[start:start + tile_size]))
+        hist = band_hist if hist is None else hist + band_hist
+    return {'luts': contrast_luts(hist, mode, min_out, max_out, low_pct, high_pct)}
+
+
+def _contrast_tile(image: np.ndarray, luts: np.ndarray = None, **params) -> np.ndarray:
+    """Contrast with the tables built from the whole image (other params were used by the first pass)."""
+    if luts is None:  # Not uint8: only valid on the whole image (see tile_dtypes)
+        return adjust_contrast(image, **params)
+    return apply_lut(image, luts if image.ndim == 3 else luts[0])
+
+
+register_filter('grayscale', grayscale)
+register_filter('edge_detection', _edge_magnitude, halo=1, normalize=True)
+register_filter('horizontal_flip', horizontal_flip, tileable=False)
+register_filter('resize', resize, tileable=False, pixel_params=('new_height', 'new_width'))
+register_filter('sharpen', sharpen, halo=1)
+register_filter('brightness', adjust_brightness)
+register_filter('contrast', _contrast_tile, tile_dtypes=(np.uint8,), prepare=_contrast_range)
+register_filter('saturation', adjust_saturation)
+register_filter('clahe', clahe, tileable=False)
+# Blur reach depends on sigma/radius, so it cannot be a fixed halo
+register_filter('gaussian_blur', gaussian_blur, tileable=False, pixel_params=('sigma',))
+register_filter('box_blur', box_blur, tileable=False, pixel_params=('radius',))
@@ -1,79 +1,215 @@
 import numpy as np
+from functools import lru_cache
+from buffers import scratch, prepare_out
 
-# Nearest Neighbor
-def resize_nearest_neighbor(image: np.ndarray, new_height: int, new_width: int) -> np.ndarray:
+
+'''Gather tables'''
+def _axis_table(src_len: int, dst_len: int, method: str) -> tuple:
     """
-    Resize image using nearest neighbor interpolation.
+    Builds the source index/weight table for resampling one axis.
 
     Args:
-        image (np.ndarray): Input image array (H x W x C).
-        new_height (int): Desired height.
-        new_width (int): Desired width.
+        src_len (int): Source length along the axis.
+        dst_len (int): Target length along the axis.
+        method (str): 'nearest', 'bilinear' or 'area'.
 
     Returns:
-        np.ndarray: Resized image.
+        tuple: (kind, *arrays) describing how each output sample is gathered.
+    """
+    scale = src_len / dst_len
+    positions = np.arange(dst_len) * scale
+
+    if method == 'nearest':
+        # Same truncation as int(i * scale)
+        return ('nearest', positions.astype(np.intp))
+
+    if method == 'area' and dst_len <= src_len:
+        # Each output sample averages the source span [i*scale, (i+1)*scale).
+        # When downscaling a source pixel k overlaps at most two output bins:
+        # the one containing its start and, if it straddles an edge, the next.
+        src = np.arange(src_len)
+        bins = np.minimum((src / scale).astype(np.intp), dst_len - 1)
+        bin_end = (bins + 1) * scale
+        spill = np.clip((src + 1) - bin_end, 0, 1)
+        spill[bins == dst_len - 1] = 0
+
+        starts = np.searchsorted(bins, np.arange(dst_len))
+        main_w = ((1 - spill) / scale).astype(np.float32)
+        spill_src = np.nonzero(spill > 0)[0]
+        spill_dst = bins[spill_src] + 1
+        spill_w = (spill[spill_src] / scale).astype(np.float32)
+        return ('area', starts, main_w, spill_src, spill_dst, spill_w)
+
+    # Bilinear (also used by 'area' on an axis that is being enlarged)
+    i0 = np.floor(positions).astype(np.intp)
+    i1 = np.minimum(i0 + 1, src_len - 1)
+    w = (positions - i0).astype(np.float32)
+    return ('bilinear', i0, i1, w)
+
+
+@lru_cache(maxsize=32)
+def _resize_tables(src_shape: tuple, dst_shape: tuple, method: str) -> tuple:
     """
-    height, width = image.shape[:2]
-    channels = image.shape[2] if image.ndim == 3 else 1
+    Returns the cached (row_table, col_table) for a resize.
 
-    # Create empty output image
-    resized = np.zeros((new_height, new_width, channels), dtype=image.dtype)
+    Tables depend only on the source shape, target shape and method, so a
+    stream of same-sized frames resized to the same target reuses them.
+    """
+    rows = _axis_table(src_shape[0], dst_shape[0], method)
+    cols = _axis_table(src_shape[1], dst_shape[1], method)
+    return rows, cols
 
-    # Compute scale
-    row_scale = height / new_height
-    col_scale = width / new_width
 
-    for i in range(new_height):
-        for j in range(new_width):
-            # Find nearest neighbor in original image
-            src_row = int(i * row_scale)
-            src_col = int(j * col_scale)
-            resized[i, j] = image[src_row, src_col] if channels > 1 else image[src_row, src_col]
+def _weights_for(w: np.ndarray, ndim: int, axis: int) -> np.ndarray:
+    """Reshapes a 1D weight vector so it broadcasts along the given axis."""
+    shape = [1] * ndim
+    shape[axis] = -1
+    return w.reshape(shape)
 
-    return resized.squeeze()
 
+def _resample_axis(a: np.ndarray, table: tuple, axis: int, out: np.ndarray) -> np.ndarray:
+    """
+    Applies one axis table to a float32 array.
 
-# Bilinear
-def resize_bilinear(image: np.ndarray, new_height: int, new_width: int) -> np.ndarray:
+    Args:
+        a (np.ndarray): Input array (float32).
+        table (tuple): Table from _axis_table.
+        axis (int): Axis to resample (0 = rows, 1 = columns).
+        out (np.ndarray): float32 output, resampled along the axis.
+
+    Returns:
+        np.ndarray: out.
     """
-    Resize image using bilinear interpolation.
+    kind = table[0]
+
+    # mode='clip' lets take write straight into out (indices are in range anyway)
+    if kind == 'nearest':
+        return np.take(a, table[1], axis=axis, out=out, mode='clip')
+
+    if kind == 'bilinear':
+        _, i0, i1, w = table
+        w = _weights_for(w, a.ndim, axis)
+        low = np.take(a, i0, axis=axis, out=out, mode='clip')
+        high = np.take(a, i1, axis=axis, out=scratch(f'resize.high{axis}', out.shape), mode='clip')
+        high -= low
+        high *= w
+        low += high
+        return low
+
+    _, starts, main_w, spill_src, spill_dst, spill_w = table
+    weighted = np.multiply(a, _weights_for(main_w, a.ndim, axis), out=scratch(f'resize.weighted{axis}', a.shape))
+    np.add.reduceat(weighted, starts, axis=axis, out=out)
+    if len(spill_src):
+        spilled = np.take(a, spill_src, axis=axis)
+        spilled *= _weights_for(spill_w, a.ndim, axis)
+        index = [slice(None)] * a.ndim
+        index[axis] = spill_dst
+        out[tuple(index)] += spilled
+    return out
+
+
+def resize(image: np.ndarray, new_height: int, new_width: int, method: str = 'bilinear',
+           out: np.ndarray = None) -> np.ndarray:
+    """
+    Resizes a grayscale or multi-channel image with precomputed gather tables.
+
+    Intermediate results live in reusable float32 scratch space, so resizing a
+    stream of same-sized frames into a preallocated out allocates no frame-sized
+    arrays after the first call.
 
     Args:
-        image (np.ndarray): Input image array (H x W x C).
+        image (np.ndarray): Input image array (H x W or H x W x C).
         new_height (int): Desired height.
         new_width (int): Desired width.
+        method (str): 'nearest', 'bilinear' or 'area' (area averaging for
+            downscaling; enlarged axes fall back to bilinear).
+        out (np.ndarray): Optional preallocated output (uint8, or the input's
+            dtype for 'nearest').
 
     Returns:
         np.ndarray: Resized image.
     """
-    height, width = image.shape[:2]
-    channels = image.shape[2] if image.ndim == 3 else 1
-    resized = np.zeros((new_height, new_width, channels), dtype=np.float32)
+    if image.ndim not in (2, 3):
+        raise ValueError("Unsupported image dimensions. Expected 2D or 3D array.")
+    if method not in ('nearest', 'bilinear', 'area'):
+        raise ValueError("Invalid method. Use 'nearest', 'bilinear' or 'area'.")
+    if new_height < 1 or new_width < 1:
+        raise ValueError("Target size must be at least 1x1.")
+
+    rows, cols = _resize_tables(image.shape[:2], (new_height, new_width), method)
+    out_shape = (new_height, new_width) + image.shape[2:]
+
+    if method == 'nearest':
+        # Pure gather: no arithmetic, dtype preserved
+        if out is None:
+            return image[rows[1][:, np.newaxis], cols[1]]
+        picked = scratch('resize.rows', (new_height,) + image.shape[1:], image.dtype)
+        np.take(image, rows[1], axis=0, out=picked, mode='clip')
+        out = prepare_out(out, out_shape, image.dtype)
+        return np.take(picked, cols[1], axis=1, out=out, mode='clip')
+
+    # Resample the axis that shrinks the most first, to touch fewer pixels
+    work = scratch('resize.input', image.shape)
+    work[...] = image
+    if new_height / image.shape[0] <= new_width / image.shape[1]:
+        middle = scratch('resize.middle', (new_height,) + image.shape[1:])
+        work = _resample_axis(work, rows, 0, middle)
+        work = _resample_axis(work, cols, 1, scratch('resize.output', out_shape))
+    else:
+        middle = scratch('resize.middle', (image.shape[0], new_width) + image.shape[2:])
+        work = _resample_axis(work, cols, 1, middle)
+        work = _resample_axis(work, rows, 0, scratch('resize.output', out_shape))
+
+    np.rint(work, out=work)
+    np.clip(work, 0, 255, out=work)
+    out = prepare_out(out, out_shape, np.uint8)
+    np.copyto(out, work, casting='unsafe')
+    return out
 
-    row_scale = height / new_height
-    col_scale = width / new_width
 
-    for i in range(new_height):
-        for j in range(new_width):
-            x = i * row_scale
-            y = j * col_scale
+# Nearest Neighbor
+def resize_nearest_neighbor(image: np.ndarray, new_height: int, new_width: int) -> np.ndarray:
+    """
+    Resize image using nearest neighbor interpolation.
 
-            x0 = int(np.floor(x))
-            x1 = min(x0 + 1, height - 1)
-            y0 = int(np.floor(y))
-            y1 = min(y0 + 1, width - 1)
+    Args:
+        image (np.ndarray): Input image array (H x W x C).
+        new_height (int): Desired height.
+        new_width (int): Desired width.
 
-            dx = x - x0
-            dy = y - y0
+    Returns:
+        np.ndarray: Resized image.
+    """
+    return resize(image, new_height, new_width, method='nearest')
 
-            for c in range(channels):
-                top = (1 - dy) * image[x0, y0, c] + dy * image[x0, y1, c]
-                bottom = (1 - dy) * image[x1, y0, c] + dy * image[x1, y1, c]
-                resized[i, j, c] = (1 - dx) * top + dx * bottom
 
-    return np.clip(resized, 0, 255).astype(np.uint8).squeeze()
+# Bilinear
+def resize_bilinear(image: np.ndarray, new_height: int, new_width: int) -> np.ndarray:
+    """
+    Resize image using bilinear interpolation.
 
+    Args:
+        image (np.ndarray): Input image array (H x W x C).
+        new_height (int): Desired height.
+        new_width (int): Desired width.
 
+    Returns:
+        np.ndarray: Resized image.
+    """
+    return resize(image, new_height, new_width, method='bilinear')
 
 
+# Area averaging
+def resize_area(image: np.ndarray, new_height: int, new_width: int) -> np.ndarray:
+    """
+    Resize image by averaging the source area covered by each output pixel.
+
+    Args:
+        image (np.ndarray): Input image array (H x W x C).
+        new_height (int): Desired height.
+        new_width (int): Desired width.
 
+    Returns:
+        np.ndarray: Resized image.
+    """
+    return resize(image, new_height, new_width, method='area')
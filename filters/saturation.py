@@ -0,0 +1,85 @@
+import numpy as np
+from buffers import scratch, prepare_out
+from color import rgb_channels, is_gray
+
+# Scaling the saturation with hue and value (HSV) or lightness (HSL) fixed
+# moves every channel along the line through a pivot P, the value max(R, G, B)
+# or the lightness (max + min) / 2:
+#     c' = P + f * (c - P)
+# so the adjustment never converts to HSV/HSL. Saturation above 1 is clipped
+# per pixel by limiting f to the largest factor that keeps every channel in
+# [0, 255] (hue is preserved):
+#     HSV: f_eff = min(f, max / (max - min))
+#     HSL: f_eff = min(f, 2 * min(P, 255 - P) / (max - min))
+# Work is done in float32 row blocks, so temporaries stay small.
+
+SATURATION_SPACES = ('hsv', 'hsl')
+
+# Pixels adjusted per block; bounds the float32 temporaries
+_BLOCK_PIXELS = 1 << 16
+
+
+def adjust_saturation(image: np.ndarray, factor: float, space: str = 'hsv',
+                      out: np.ndarray = None) -> np.ndarray:
+    """Scales colour saturation by a factor.
+
+    Args:
+        image: RGB or RGBA uint8-range image (alpha is passed through); gray
+            input has no saturation and is returned as is.
+        factor: Saturation multiplier (0 = gray, 1 = unchanged).
+        space: 'hsv' (value kept) or 'hsl' (lightness kept).
+        out: Optional preallocated uint8 output; may be the input itself.
+
+    Returns:
+        np.ndarray: Saturation-adjusted uint8 image.
+    """
+    if space not in SATURATION_SPACES:
+        raise ValueError(f"Invalid space. Use one of: {', '.join(SATURATION_SPACES)}.")
+    if factor < 0:
+        raise ValueError("factor must be non-negative.")
+    if is_gray(image):
+        if out is None:
+            return image
+        np.copyto(out, image, casting='unsafe')
+        return out
+
+    out = prepare_out(out, image.shape, np.uint8)
+    if image.shape[2] == 4 and not np.may_share_memory(out, image):
+        np.copyto(out[..., 3], image[..., 3], casting='unsafe')
+
+    block_rows = max(1, _BLOCK_PIXELS // image.shape[1])
+    for start in range(0, image.shape[0], block_rows):
+        block = image[start:start + block_rows]
+        r, g, b = rgb_channels(block)
+        high = np.maximum(r, g, out=scratch('saturation.high', r.shape))
+        np.maximum(high, b, out=high)
+        low = np.minimum(r, g, out=scratch('saturation.low', r.shape))
+        np.minimum(low, b, out=low)
+
+        if space == 'hsv':
+            pivot = high
+            headroom = high
+        else:
+            pivot = np.add(high, low, out=scratch('saturation.pivot', r.shape))
+            pivot /= 2
+            headroom = np.minimum(pivot, 255 - pivot, out=scratch('saturation.headroom', r.shape))
+            headroom *= 2
+
+        if factor <= 1:  # Channels move towards the pivot; nothing can leave [0, 255]
+            scale = factor
+        else:
+            scale = np.subtract(high, low, out=low)  # low is no longer needed
+            with np.errstate(divide='ignore', invalid='ignore'):
+                np.divide(headroom, scale, out=scale)
+            np.fmin(scale, factor, out=scale)  # Grays (0 / 0) keep the factor
+
+        # Channels are read before their plane of out is written, so out may alias image
+        channel = scratch('saturation.channel', r.shape)
+        for c, plane in enumerate((r, g, b)):
+            np.subtract(plane, pivot, out=channel)
+            channel *= scale
+            channel += pivot
+            np.rint(channel, out=channel)
+            np.clip(channel, 0, 255, out=channel)
+            np.copyto(out[start:start + block_rows, :, c], channel, casting='unsafe')
+    return out
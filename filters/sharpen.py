@@ -1,41 +1,18 @@
 import numpy as np
+from convolution import convolve2d
+from parallel import run_threaded
+from buffers import scratch, prepare_out
 
 
-def convolve2d(image: np.ndarray, kernel: np.ndarray) -> np.ndarray:
-    """
-    Applies a 2D convolution to a grayscale or single-channel image.
-
-    Args:
-        image (np.ndarray): 2D input image array.
-        kernel (np.ndarray): 2D kernel array.
-
-    Returns:
-        np.ndarray: Convolved image.
-    """
-    kernel = np.flipud(np.fliplr(kernel))  # Flip the kernel
-
-    image_height, image_width = image.shape
-    kernel_height, kernel_width = kernel.shape
-    pad_h = kernel_height // 2
-    pad_w = kernel_width // 2
-
-    padded_image = np.pad(image, ((pad_h, pad_h), (pad_w, pad_w)), mode='reflect')
-    convolved = np.zeros_like(image, dtype=np.float32)
-
-    for i in range(image_height):
-        for j in range(image_width):
-            region = padded_image[i:i + kernel_height, j:j + kernel_width]
-            convolved[i, j] = np.sum(region * kernel)
-
-    return convolved
-
-
-def sharpen(image: np.ndarray) -> np.ndarray:
+def sharpen(image: np.ndarray, workers: int = 1, out: np.ndarray = None) -> np.ndarray:
     """
     Sharpens an image using the Laplacian kernel.
 
     Args:
         image (np.ndarray): Input image (2D grayscale or 3D RGB).
+        workers (int): Threads to split channels and row bands across.
+        out (np.ndarray): Optional preallocated uint8 output; may be the input
+            image itself (in-place).
 
     Returns:
         np.ndarray: Sharpened image.
@@ -46,18 +23,22 @@ def sharpen(image: np.ndarray) -> np.ndarray:
         [0, -1,  0]
     ], dtype=np.float32)
 
-    if image.ndim == 2:  # Grayscale image
-        laplacian = convolve2d(image.astype(np.float32), laplacian_kernel)
-        sharpened = image.astype(np.float32) + laplacian
-        return np.clip(sharpened, 0, 255).astype(np.uint8)
-
-    elif image.ndim == 3:  # RGB image
-        channels = []
-        for c in range(image.shape[2]):
-            laplacian = convolve2d(image[:, :, c].astype(np.float32), laplacian_kernel)
-            sharpened = image[:, :, c].astype(np.float32) + laplacian
-            channels.append(np.clip(sharpened, 0, 255).astype(np.uint8))
-        return np.stack(channels, axis=2)
-
-    else:
+    if image.ndim not in (2, 3):
         raise ValueError("Unsupported image dimensions. Expected 2D or 3D array.")
+
+    if workers > 1:  # 3x3 kernel: one halo row per band
+        if out is not None and np.may_share_memory(out, image):
+            # Bands read their neighbours' rows, so they cannot write in place
+            np.copyto(out, run_threaded(sharpen, image, halo=1, workers=workers, split_channels=True))
+            return out
+        out = prepare_out(out, image.shape, np.uint8)
+        return run_threaded(sharpen, image, halo=1, workers=workers, split_channels=True, out=out)
+
+    # Grayscale and RGB go through the engine in one call (channels last); the
+    # Laplacian is complete before out is written, so out may alias the input
+    sharpened = convolve2d(image, laplacian_kernel, out=scratch('sharpen.laplacian', image.shape))
+    sharpened += image
+    np.clip(sharpened, 0, 255, out=sharpened)
+    out = prepare_out(out, image.shape, np.uint8)
+    np.copyto(out, sharpened, casting='unsafe')
+    return out
@@ -0,0 +1,167 @@
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+# Short-time Fourier transform on strided frame views. Frames are windowed
+# views into the (padded) signal, so framing copies nothing; all frames of a
+# batch go through one real FFT. The inverse uses weighted overlap-add with
+# window-sum normalization, which reconstructs the input exactly for any
+# window whose squared overlap-add is nonzero (e.g. Hann with hop <= frame/2).
+
+
+def hann_window(frame_size):
+    """Periodic Hann window (the variant that overlap-adds to a constant)."""
+    n = np.arange(frame_size)
+    return 0.5 - 0.5 * np.cos(2 * np.pi * n / frame_size)
+
+
+def _check_params(frame_size, hop):
+    """Validates frame and hop sizes."""
+    if hop < 1 or frame_size < 1 or hop > frame_size:
+        raise ValueError("Need 1 <= hop <= frame_size.")
+
+
+def frame_signal(signal, frame_size, hop):
+    """
+    Returns a strided (n_frames x frame_size) view of a 1D signal (no copy).
+
+    Trailing samples that do not fill a whole frame are not included.
+    """
+    if len(signal) < frame_size:
+        return np.empty((0, frame_size), dtype=signal.dtype)
+    return sliding_window_view(signal, frame_size)[::hop]
+
+
+def _padding(length, frame_size, hop):
+    """
+    Zero padding (lead, trail) placed around a signal before framing.
+
+    frame_size - hop zeros on both sides give every sample the same frame
+    coverage, edges included; the trail is extended to end on a whole frame.
+    """
+    lead = frame_size - hop
+    padded = max(length + 2 * lead, frame_size)
+    padded += -(padded - frame_size) % hop
+    return lead, padded - lead - length
+
+
+def stft(signal, frame_size=1024, hop=256, window=None):
+    """
+    Computes the STFT of a 1D signal.
+
+    Parameters:
+        signal (np.array): 1D audio samples
+        frame_size (int): Samples per frame (FFT length)
+        hop (int): Samples between frame starts
+        window (np.array): Analysis window (default: periodic Hann)
+
+    Returns:
+        np.array: Complex spectrum (n_frames x frame_size // 2 + 1)
+    """
+    _check_params(frame_size, hop)
+    window = hann_window(frame_size) if window is None else window
+    padded = np.pad(np.asarray(signal, dtype=np.float32), _padding(len(signal), frame_size, hop))
+    frames = frame_signal(padded, frame_size, hop)
+    return np.fft.rfft(frames * window.astype(np.float32), axis=1)
+
+
+def istft(spectrum, hop=256, length=None, window=None):
+    """
+    Inverts stft with weighted overlap-add (perfect reconstruction).
+
+    Parameters:
+        spectrum (np.array): Complex STFT (n_frames x frame_size // 2 + 1)
+        hop (int): Hop used for the forward transform
+        length (int): Original signal length (trims the padding)
+        window (np.array): Window used for the forward transform
+
+    Returns:
+        np.array: Reconstructed signal (float32)
+    """
+    frame_size = 2 * (spectrum.shape[1] - 1)
+    _check_params(frame_size, hop)
+    if frame_size % hop:
+        raise ValueError("istft needs frame_size to be a multiple of hop.")
+    window = hann_window(frame_size) if window is None else window
+
+    frames = np.fft.irfft(spectrum, n=frame_size, axis=1) * window
+    n_frames = len(frames)
+    overlap = frame_size // hop
+
+    # Overlap-add as frame_size / hop shifted block additions
+    out = np.zeros((n_frames + overlap - 1, hop))
+    norm = np.zeros((n_frames + overlap - 1, hop))
+    squared = window ** 2
+    for j in range(overlap):
+        out[j:j + n_frames] += frames[:, j * hop:(j + 1) * hop]
+        norm[j:j + n_frames] += squared[j * hop:(j + 1) * hop]
+
+    out, norm = out.ravel(), norm.ravel()
+    np.divide(out, norm, out=out, where=norm > 1e-10)
+
+    lead = frame_size - hop
+    end = len(out) if length is None else lead + length
+    return out[lead:end].astype(np.float32)
+
+
+def stft_stream(blocks, frame_size=1024, hop=256, window=None):
+    """
+    Streaming STFT: yields spectrum columns as soon as their frame is complete.
+
+    Columns are identical to the rows of stft() over the concatenated blocks;
+    only one frame of history is kept, so memory does not grow with duration.
+
+    Parameters:
+        blocks (iterable): 1D sample blocks
+        frame_size (int): Samples per frame (FFT length)
+        hop (int): Samples between frame starts
+        window (np.array): Analysis window (default: periodic Hann)
+
+    Yields:
+        np.array: Complex column of frame_size // 2 + 1 bins
+    """
+    _check_params(frame_size, hop)
+    window = (hann_window(frame_size) if window is None else window).astype(np.float32)
+    buffer = np.zeros(frame_size - hop, dtype=np.float32)  # Same lead padding as stft
+    total = 0
+
+    def drain(buffer):
+        frames = frame_signal(buffer, frame_size, hop)
+        for column in np.fft.rfft(frames * window, axis=1):
+            yield column
+        return buffer[len(frames) * hop:]
+
+    for block in blocks:
+        total += len(block)
+        buffer = np.concatenate((buffer, np.asarray(block, dtype=np.float32)))
+        buffer = yield from drain(buffer)
+
+    # Flush with the trailing padding stft would have added
+    _, trail = _padding(total, frame_size, hop)
+    yield from drain(np.concatenate((buffer, np.zeros(trail, dtype=np.float32))))
+
+
+def spectrogram(signal, sample_rate, frame_size=1024, hop=None, max_columns=2000):
+    """
+    Computes a magnitude spectrogram in dB for display.
+
+    Parameters:
+        signal (np.array): 1D audio samples
+        sample_rate (int): Sampling rate in Hz
+        frame_size (int): Samples per frame
+        hop (int): Hop size (default: frame_size // 4, widened so that at most
+            max_columns frames are computed for long signals)
+        max_columns (int): Column budget used when hop is not given
+
+    Returns:
+        tuple: (times in s, frequencies in Hz, magnitude in dB as bins x frames)
+    """
+    if hop is None:
+        hop = max(frame_size // 4, -(-len(signal) // max_columns))
+    # Frames are centred on their time stamps
+    padded = np.pad(np.asarray(signal, dtype=np.float32), frame_size // 2)
+    frames = frame_signal(padded, frame_size, hop)
+    magnitude = np.abs(np.fft.rfft(frames * hann_window(frame_size).astype(np.float32), axis=1))
+
+    times = np.arange(len(frames)) * hop / sample_rate
+    freqs = np.fft.rfftfreq(frame_size, 1 / sample_rate)
+    return times, freqs, 20 * np.log10(magnitude.T + 1e-10)
@@ -0,0 +1,144 @@
+import os
+import tempfile
+import numpy as np
+from registry import get_filter
+from edge_detection import normalize_magnitude
+
+# Out-of-core execution: the source is read through a memory map (or any
+# array-like that supports slicing), each tile is filtered with a halo of
+# neighbouring pixels around it, and only the tile's own region is written to a
+# memory-mapped .npy output. Peak memory is bounded by the tile size.
+
+DEFAULT_TILE_SIZE = 1024
+
+
+def open_source(source):
+    """
+    Opens an image source for tiled reading without loading it.
+
+    Args:
+        source: Path to a .npy file (memory-mapped read-only), or an array-like
+            such as np.ndarray / np.memmap.
+
+    Returns:
+        Array-like supporting shape, dtype and slicing.
+    """
+    if isinstance(source, (str, os.PathLike)):
+        if not str(source).lower().endswith('.npy'):
+            raise ValueError("Tiled processing reads .npy files; convert the image first.")
+        return np.load(source, mmap_mode='r')
+    return source
+
+
+def iter_tiles(shape: tuple, tile_size: int, halo: int = 0):
+    """
+    Yields tile windows covering an image, each with its halo clipped to the image.
+
+    Args:
+        shape (tuple): Image shape (H, W[, C]).
+        tile_size (int): Tile edge length in pixels.
+        halo (int): Extra pixels read around each tile.
+
+    Yields:
+        tuple: (out_window, in_window, crop) where out_window and in_window are
+            (row_slice, col_slice) into the image and crop is the
+            (row_slice, col_slice) of the tile inside the halo-extended block.
+    """
+    height, width = shape[:2]
+    for top in range(0, height, tile_size):
+        bottom = min(top + tile_size, height)
+        in_top, in_bottom = max(0, top - halo), min(height, bottom + halo)
+        for left in range(0, width, tile_size):
+            right = min(left + tile_size, width)
+            in_left, in_right = max(0, left - halo), min(width, right + halo)
+            out_window = (slice(top, bottom), slice(left, right))
+            in_window = (slice(in_top, in_bottom), slice(in_left, in_right))
+            crop = (slice(top - in_top, bottom - in_top), slice(left - in_left, right - in_left))
+            yield out_window, in_window, crop
+
+
+def _filtered_tiles(source, spec: dict, tile_size: int, params: dict):
+    """Yields (out_window, filtered tile) for every tile of the source."""
+    for out_window, in_window, crop in iter_tiles(source.shape, tile_size, spec['halo']):
+        block = np.asarray(source[in_window])
+        yield out_window, spec['func'](block, **params)[crop]
+
+
+def process_tiled(source, filter_name: str, out_path: str,
+                  tile_size: int = DEFAULT_TILE_SIZE, **params) -> np.memmap:
+    """
+    Applies a registered filter tile by tile, writing to a memory-mapped .npy file.
+
+    The output is identical to running the filter on the whole image: tiles
+    read a halo of real neighbouring pixels, and filters that depend on global
+    statistics get them from an extra streaming pass.
+
+    Args:
+        source: .npy path or array-like image (H x W or H x W x C).
+        filter_name (str): Name of a tileable filter in the registry.
+        out_path (str): Destination .npy path.
+        tile_size (int): Tile edge length in pixels.
+        **params: Filter parameters.
+
+    Returns:
+        np.memmap: The output image, memory-mapped from out_path.
+    """
+    spec = get_filter(filter_name)
+    if not spec['tileable']:
+        raise ValueError(f"Filter '{filter_name}' cannot be applied per tile.")
+    if tile_size <= spec['halo']:
+        raise ValueError("tile_size must be larger than the filter halo.")
+
+    source = open_source(source)
+    if min(source.shape[:2]) == 0:
+        raise ValueError("Cannot tile an empty image.")
+    if spec['tile_dtypes'] is not None and source.dtype not in spec['tile_dtypes']:
+        raise ValueError(f"Filter '{filter_name}' can only be applied per tile to "
+                         f"{', '.join(map(str, spec['tile_dtypes']))} images.")
+    if spec['prepare'] is not None:
+        params.update(spec['prepare'](source, tile_size, **params))
+
+    tiles = _filtered_tiles(source, spec, tile_size, params)
+    if not spec['normalize']:
+        return _write_tiles(tiles, source.shape, out_path)
+
+    # Two passes: raw magnitude into a scratch map while tracking the global
+    # peak, then the same scaling as the whole-image path, tile by tile.
+    scratch_fd, scratch_path = tempfile.mkstemp(suffix='.npy', dir=os.path.dirname(os.path.abspath(out_path)))
+    os.close(scratch_fd)
+    try:
+        peak = None
+        def tracked():
+            nonlocal peak
+            for window, tile in tiles:
+                tile_peak = tile.max()
+                peak = tile_peak if peak is None else max(peak, tile_peak)
+                yield window, tile
+
+        raw = _write_tiles(tracked(), source.shape, scratch_path)
+        rescaled = ((window, normalize_magnitude(np.array(raw[window]), peak))
+                    for window, _, _ in iter_tiles(raw.shape, tile_size))
+        out = _write_tiles(rescaled, raw.shape, out_path)
+        del raw
+    finally:
+        os.remove(scratch_path)
+    return out
+
+
+def _write_tiles(tiles, shape: tuple, out_path: str) -> np.memmap:
+    """
+    Writes (window, tile) pairs into a new .npy memory map.
+
+    The output dtype and channel layout are taken from the first tile, so
+    at least one tile is required.
+    """
+    out = None
+    for window, tile in tiles:
+        if out is None:
+            out_shape = tuple(shape[:2]) + tile.shape[2:]
+            out = np.lib.format.open_memmap(out_path, mode='w+', dtype=tile.dtype, shape=out_shape)
+        out[window] = tile
+    if out is None:
+        raise ValueError("No tiles to write (empty image).")
+    out.flush()
+    return out
@@ -0,0 +1,132 @@
+import numpy as np
+from buffers import prepare_out
+
+# Geometric transforms are pure index remappings, so they are returned as
+# strided views of the input (zero-copy). Pass copy=True for a contiguous
+# result, out= to fill a preallocated buffer, or inplace=True (flips / 180
+# rotation) to rewrite the input buffer.
+
+
+def _check_image(image: np.ndarray) -> None:
+    """Validates that the image is 2D (grayscale) or 3D (channels last)."""
+    if image.ndim not in (2, 3):
+        raise ValueError("Unsupported image shape: must be 2D or 3D numpy array.")
+
+
+def _finish(image: np.ndarray, view: np.ndarray, copy: bool, inplace: bool,
+            out: np.ndarray = None) -> np.ndarray:
+    """Returns the view, a contiguous copy of it, or writes it into out or back into image."""
+    if copy + inplace + (out is not None) > 1:
+        raise ValueError("copy, inplace and out are mutually exclusive.")
+    if out is not None:
+        np.copyto(prepare_out(out, view.shape, view.dtype), view)
+        return out
+    if inplace:
+        # NumPy buffers overlapping assignments, so this is safe on a view of itself
+        image[...] = view
+        return image
+    if copy:
+        return np.ascontiguousarray(view)
+    return view
+
+
+def flip_horizontal(image: np.ndarray, copy: bool = False, inplace: bool = False,
+                    out: np.ndarray = None) -> np.ndarray:
+    """
+    Mirrors an image left to right.
+
+    Args:
+        image (np.ndarray): 2D (grayscale) or 3D (RGB) numpy array image.
+        copy (bool): Return a contiguous copy instead of a view.
+        out (np.ndarray): Optional preallocated output to copy the result into.
+        inplace (bool): Flip the input buffer itself and return it.
+
+    Returns:
+        np.ndarray: Horizontally flipped image.
+    """
+    _check_image(image)
+    return _finish(image, image[:, ::-1], copy, inplace, out)
+
+
+def flip_vertical(image: np.ndarray, copy: bool = False, inplace: bool = False,
+                  out: np.ndarray = None) -> np.ndarray:
+    """
+    Mirrors an image top to bottom.
+
+    Args:
+        image (np.ndarray): 2D (grayscale) or 3D (RGB) numpy array image.
+        copy (bool): Return a contiguous copy instead of a view.
+        out (np.ndarray): Optional preallocated output to copy the result into.
+        inplace (bool): Flip the input buffer itself and return it.
+
+    Returns:
+        np.ndarray: Vertically flipped image.
+    """
+    _check_image(image)
+    return _finish(image, image[::-1], copy, inplace, out)
+
+
+def rotate90(image: np.ndarray, k: int = 1, copy: bool = False, out: np.ndarray = None) -> np.ndarray:
+    """
+    Rotates an image counter-clockwise by k * 90 degrees.
+
+    Args:
+        image (np.ndarray): 2D (grayscale) or 3D (RGB) numpy array image.
+        k (int): Number of quarter turns (negative turns rotate clockwise).
+        copy (bool): Return a contiguous copy instead of a view.
+        out (np.ndarray): Optional preallocated output to copy the result into.
+
+    Returns:
+        np.ndarray: Rotated image.
+    """
+    _check_image(image)
+    return _finish(image, np.rot90(image, k, axes=(0, 1)), copy, False, out)
+
+
+def rotate180(image: np.ndarray, copy: bool = False, inplace: bool = False,
+              out: np.ndarray = None) -> np.ndarray:
+    """
+    Rotates an image by 180 degrees.
+
+    Args:
+        image (np.ndarray): 2D (grayscale) or 3D (RGB) numpy array image.
+        copy (bool): Return a contiguous copy instead of a view.
+        out (np.ndarray): Optional preallocated output to copy the result into.
+        inplace (bool): Rotate the input buffer itself and return it.
+
+    Returns:
+        np.ndarray: Rotated image.
+    """
+    _check_image(image)
+    return _finish(image, image[::-1, ::-1], copy, inplace, out)
+
+
+def rotate270(image: np.ndarray, copy: bool = False, out: np.ndarray = None) -> np.ndarray:
+    """
+    Rotates an image counter-clockwise by 270 degrees (90 degrees clockwise).
+
+    Args:
+        image (np.ndarray): 2D (grayscale) or 3D (RGB) numpy array image.
+        copy (bool): Return a contiguous copy instead of a view.
+        out (np.ndarray): Optional preallocated output to copy the result into.
+
+    Returns:
+        np.ndarray: Rotated image.
+    """
+    return rotate90(image, 3, copy=copy, out=out)
+
+
+def transpose(image: np.ndarray, copy: bool = False, out: np.ndarray = None) -> np.ndarray:
+    """
+    Swaps the rows and columns of an image, keeping the channel axis last.
+
+    Args:
+        image (np.ndarray): 2D (grayscale) or 3D (RGB) numpy array image.
+        copy (bool): Return a contiguous copy instead of a view.
+        out (np.ndarray): Optional preallocated output to copy the result into.
+
+    Returns:
+        np.ndarray: Transposed image.
+    """
+    _check_image(image)
+    return _finish(image, image.swapaxes(0, 1), copy, False, out)
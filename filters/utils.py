@@ -1,31 +1,34 @@
+import threading
 import numpy as np
-import matplotlib.pyplot as plt
-from scipy.fft import fft, fftfreq
-from pydub import AudioSegment
-import ffmpeg
-import tempfile
-from resize import resize_bilinear
-import imageio
+import wave
+from instrumentation import stage
+
+# Heavy or optional dependencies (matplotlib, scipy, ffmpeg-python, imageio and
+# the audio modules built on them) are imported inside the functions that use
+# them, so that importing this module (and main.py, and every batch worker)
+# stays cheap and e.g. image-only or headless runs never load matplotlib.
 
 
 '''Image Utils'''
 def get_image_input():
     """Gets and validates image input"""
+    import imageio
     path = input("Enter image path: ").strip()
     try:
-        img = imageio.imread(path)
+        with stage("load"):
+            img = imageio.imread(path)
         print(f"Loaded: {path} ({img.shape[1]}x{img.shape[0]})")
         return img
     except Exception as e:
         print(f"Error loading image: {str(e)}")
         return None
 
-def resize_interactive(img):
-    """Interactive resize with validation"""
+def get_resize_params(img):
+    """Prompts for the new dimensions, returned as (height, width)"""
     print(f"Current dimensions: {img.shape[1]}x{img.shape[0]}")
     w = int(input("New width: "))
     h = int(input("New height: "))
-    return resize_bilinear(img, h, w)
+    return h, w
 
 def get_float_input(prompt, min_val, max_val):
     """Validates float input"""
@@ -39,30 +42,44 @@ def get_float_input(prompt, min_val, max_val):
             print("Invalid number")
 
 def get_contrast_params():
-    """Gets contrast adjustment parameters"""
+    """Gets contrast adjustment parameters as keyword arguments for adjust_contrast"""
+    mode = input("Mode (minmax/percentile/equalize) [minmax]: ").strip().lower() or 'minmax'
+    if mode not in ('minmax', 'percentile', 'equalize'):
+        print("Unknown mode, using minmax")
+        mode = 'minmax'
     min_out = int(input("Minimum output value (0-254): "))
     max_out = int(input("Maximum output value (1-255): "))
-    return max(0, min(min_out, 254)), min(255, max(max_out, 1))
+    return {'mode': mode, 'min_out': max(0, min(min_out, 254)), 'max_out': min(255, max(max_out, 1))}
+
+def get_clahe_params():
+    """Gets adaptive contrast (CLAHE) parameters as keyword arguments for clahe"""
+    grid = int(get_float_input("Tiles per axis (1-64): ", 1, 64))
+    clip_limit = get_float_input("Clip limit (1.0-10.0): ", 1.0, 10.0)
+    return {'grid': grid, 'clip_limit': clip_limit}
 
 def show_comparison(original, processed, title):
     """Displays before/after comparison for images"""
-    plt.figure(figsize=(12, 6))
-    plt.subplot(1, 2, 1)
-    plt.imshow(original if original.ndim == 3 else original, cmap='gray')
-    plt.title("Original")
-    plt.subplot(1, 2, 2)
-    plt.imshow(processed if processed.ndim == 3 else processed, cmap='gray')
-    plt.title(title)
+    import matplotlib.pyplot as plt
+    with stage("plot"):
+        plt.figure(figsize=(12, 6))
+        plt.subplot(1, 2, 1)
+        plt.imshow(original if original.ndim == 3 else original, cmap='gray')
+        plt.title("Original")
+        plt.subplot(1, 2, 2)
+        plt.imshow(processed if processed.ndim == 3 else processed, cmap='gray')
+        plt.title(title)
     plt.show()
 
 def save_output(data, default_path, is_audio=False):
     """Saves processed output"""
+    import imageio
     path = input(f"Enter output path [default: {default_path}]: ").strip() or default_path
     try:
-        if is_audio:
-            save_audio(path, data[0], data[1])
-        else:
-            imageio.imwrite(path, data)
+        with stage("save"):
+            if is_audio:
+                save_audio(path, data[0], data[1])
+            else:
+                imageio.imwrite(path, data)
         print(f"Saved to {path}")
     except Exception as e:
         print(f"Error saving file: {str(e)}")
@@ -71,109 +88,404 @@ def save_output(data, default_path, is_audio=False):
 
 
 ''''Audio Utils'''
-def plot_audio_frequency(signal, sample_rate, title="Frequency Spectrum"):
+def audio_spectrum(signal, sample_rate):
     """
-    Plots the frequency spectrum of an audio signal
+    Computes the single-sided magnitude spectrum of an audio signal
     
     Args:
         signal: Audio samples (1D numpy array)
         sample_rate: Sampling rate in Hz
-        title: Plot title
+
+    Returns:
+        tuple: (frequencies in Hz, magnitudes), N // 2 bins each
     """
+    from scipy.fft import rfft, rfftfreq
     N = len(signal)
-    yf = fft(signal)
-    xf = fftfreq(N, 1/sample_rate)[:N//2]
+    yf = rfft(signal)
+    xf = rfftfreq(N, 1/sample_rate)[:N//2]
+    return xf, 2/N * np.abs(yf[:N//2])
+
+def minmax_envelope(x, y, n_columns):
+    """
+    Reduces a curve to a per-pixel-column min/max envelope for plotting
+    
+    Each of n_columns buckets contributes its minimum and maximum, so the drawn
+    line covers exactly the same vertical extent per pixel as the full data
+    while render cost depends on figure width rather than signal length.
     
-    plt.figure(figsize=(10, 4))
-    plt.plot(xf, 2/N * np.abs(yf[:N//2]))
-    plt.title(title)
-    plt.xlabel("Frequency (Hz)")
-    plt.ylabel("Magnitude")
-    plt.grid()
+    Args:
+        x, y: Curve samples (1D numpy arrays, x sorted)
+        n_columns: Number of buckets (typically the plot width in pixels)
+
+    Returns:
+        tuple: (x, y) with at most 2 * n_columns points
+    """
+    if len(y) <= 2 * n_columns:
+        return x, y
+    starts = np.linspace(0, len(y), n_columns, endpoint=False).astype(np.intp)
+    env = np.empty((n_columns, 2), dtype=y.dtype)
+    env[:, 0] = np.minimum.reduceat(y, starts)
+    env[:, 1] = np.maximum.reduceat(y, starts)
+    return np.repeat(x[starts], 2), env.ravel()
+
+def _plot_width_px():
+    """Width in pixels of the current axes, used as the envelope resolution"""
+    import matplotlib.pyplot as plt
+    ax = plt.gca()
+    return max(1, int(ax.get_window_extent().width))
+
+def plot_audio_frequency(signal, sample_rate, title="Frequency Spectrum", spectrum=None):
+    """
+    Plots the frequency spectrum of an audio signal
+    
+    Args:
+        signal: Audio samples (1D numpy array)
+        sample_rate: Sampling rate in Hz
+        title: Plot title
+        spectrum: Precomputed (frequencies, magnitudes) from audio_spectrum
+
+    Returns:
+        tuple: The (frequencies, magnitudes) spectrum, for reuse in later plots
+    """
+    import matplotlib.pyplot as plt
+    with stage("plot"):
+        if spectrum is None:
+            spectrum = audio_spectrum(signal, sample_rate)
+        
+        plt.figure(figsize=(10, 4))
+        plt.plot(*minmax_envelope(*spectrum, _plot_width_px()))
+        plt.title(title)
+        plt.xlabel("Frequency (Hz)")
+        plt.ylabel("Magnitude")
+        plt.grid()
     plt.show()
+    return spectrum
+
+# Raw PCM formats ffmpeg can write to a pipe, by output dtype
+PCM_FORMATS = {
+    np.dtype(np.int16): ('s16le', 'pcm_s16le'),
+    np.dtype(np.int32): ('s32le', 'pcm_s32le'),
+    np.dtype(np.float32): ('f32le', 'pcm_f32le'),
+}
+
+def _drain(stream):
+    """Collects a pipe's output on a daemon thread, so the writer never blocks on a full pipe"""
+    chunks = []
+    thread = threading.Thread(target=lambda: chunks.extend(iter(lambda: stream.read(4096), b'')), daemon=True)
+    thread.start()
+    return thread, chunks
+
+def _open_pcm_pipe(file_path, dtype, sample_rate):
+    """
+    Starts ffmpeg decoding to raw interleaved PCM on stdout
+
+    Returns:
+        tuple: (process, channels, est. frames, stderr drain); ffmpeg only
+            logs errors, and its stderr is read on a thread while stdout is consumed
+    """
+    import ffmpeg
+    dtype = np.dtype(dtype)
+    if dtype not in PCM_FORMATS:
+        raise ValueError(f"Unsupported dtype {dtype}; use one of {', '.join(map(str, PCM_FORMATS))}")
+    fmt, codec = PCM_FORMATS[dtype]
+
+    info = ffmpeg.probe(file_path)
+    stream = next((s for s in info['streams'] if s.get('codec_type') == 'audio'), None)
+    if stream is None:
+        raise ValueError(f"No audio stream in {file_path}")
+    channels = int(stream['channels'])
+    duration = float(stream.get('duration') or info['format'].get('duration') or 0)
+
+    process = (ffmpeg
+               .input(file_path)
+               .output('pipe:', format=fmt, acodec=codec, ar=sample_rate, ac=channels)
+               .global_args('-loglevel', 'error')
+               .run_async(pipe_stdout=True, pipe_stderr=True))
+    return process, channels, int(duration * sample_rate), _drain(process.stderr)
+
+def _close_pcm_pipe(process, stderr, check=True):
+    """
+    Closes an ffmpeg PCM pipe and waits for the process
+
+    Args:
+        process: ffmpeg process from _open_pcm_pipe
+        stderr: Its stderr drain
+        check: Raise if ffmpeg failed (skipped when the reader stopped early,
+            where the closed pipe makes ffmpeg exit with an error anyway)
+    """
+    process.stdout.close()
+    process.wait()
+    stderr[0].join()
+    if check and process.returncode != 0:
+        message = b''.join(stderr[1]).decode(errors='replace').strip()
+        raise RuntimeError(f"ffmpeg failed with exit code {process.returncode}: {message or 'no error output'}")
+
+def iter_audio_chunks(file_path, chunk_frames=65536, dtype=np.int16, sample_rate=44100):
+    """
+    Decodes any audio format through an ffmpeg pipe, yielding chunks
+
+    Args:
+        file_path: Audio file (any format ffmpeg reads)
+        chunk_frames: Frames per yielded chunk
+        dtype: Output sample dtype (int16, int32 or float32)
+        sample_rate: Output sampling rate in Hz
+
+    Yields:
+        np.ndarray: (frames x channels) chunks; no intermediate files are written
+    """
+    process, channels, _, stderr = _open_pcm_pipe(file_path, dtype, sample_rate)
+    frame_bytes = np.dtype(dtype).itemsize * channels
+    completed = False
+    try:
+        while True:
+            raw = process.stdout.read(chunk_frames * frame_bytes)
+            if not raw:
+                break
+            usable = len(raw) - len(raw) % frame_bytes
+            yield np.frombuffer(raw[:usable], dtype=dtype).reshape(-1, channels)
+        completed = True
+    finally:
+        _close_pcm_pipe(process, stderr, check=completed)
+
+def decode_audio(file_path, dtype=np.int16, sample_rate=44100):
+    """
+    Decodes any audio format straight into a preallocated NumPy buffer
+
+    The buffer is sized from the probed duration and ffmpeg's stdout is read
+    into it in place (grown if the estimate was short, trimmed at the end).
 
-def load_audio(file_path):
-    """Loads audio file in any format using pydub"""
+    Args:
+        file_path: Audio file (any format ffmpeg reads)
+        dtype: Output sample dtype (int16, int32 or float32)
+        sample_rate: Output sampling rate in Hz
+
+    Returns:
+        tuple: (sample_rate, samples as frames x channels)
+    """
+    process, channels, est_frames, stderr = _open_pcm_pipe(file_path, dtype, sample_rate)
+    frame_bytes = np.dtype(dtype).itemsize * channels
+    buffer = np.empty((est_frames + sample_rate) * channels, dtype=dtype)
+    filled = 0  # bytes
+    completed = False
     try:
-        # Convert to WAV if not already
-        if not file_path.lower().endswith('.wav'):
-            with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as tmp:
-                temp_wav = tmp.name
-            
-                (ffmpeg
-                .input(file_path)
-                .output(temp_wav, acodec='pcm_s16le', ar='44100')
-                .run(quiet=True))
-            file_path = temp_wav
-            
-        audio = AudioSegment.from_wav(file_path)
-        samples = np.array(audio.get_array_of_samples())
-        
-        # Handle stereo -> mono conversion
-        if audio.channels == 2:
-            samples = samples.reshape((-1, 2))
-            samples = samples.mean(axis=1)
-            
-        return audio.frame_rate, samples
+        while True:
+            view = memoryview(buffer).cast('B')
+            if filled == len(view):
+                buffer = np.concatenate((buffer, np.empty_like(buffer)))
+                continue
+            n = process.stdout.readinto(view[filled:])
+            if not n:
+                break
+            filled += n
+        completed = True
+    finally:
+        _close_pcm_pipe(process, stderr, check=completed)
+
+    frames = filled // frame_bytes
+    return sample_rate, buffer[:frames * channels].reshape(frames, channels)
+
+# Frames processed at a time when downmixing or writing large arrays
+AUDIO_CHUNK_FRAMES = 1 << 18
+
+def downmix(samples, chunk_frames=AUDIO_CHUNK_FRAMES):
+    """
+    Averages the channels of a (frames x channels) array, one chunk at a time
+
+    Integer input stays in its own dtype (rounded mean) and float input is
+    reduced in float32, so no full-length float64 temporary is created and a
+    memory-mapped input is only paged in chunk by chunk.
+    """
+    if samples.ndim == 1:
+        return samples
+    is_int = np.issubdtype(samples.dtype, np.integer)
+    out = np.empty(len(samples), dtype=samples.dtype if is_int else np.float32)
+    for start in range(0, len(samples), chunk_frames):
+        mean = samples[start:start + chunk_frames].mean(axis=1, dtype=np.float32)
+        out[start:start + chunk_frames] = np.rint(mean) if is_int else mean
+    return out
+
+def _load_wav(file_path):
+    """Memory-maps a WAV file's data chunk (falls back to reading for formats that can't be mapped)"""
+    from scipy.io import wavfile
+    try:
+        return wavfile.read(file_path, mmap=True)
+    except ValueError:  # e.g. 24-bit PCM has no matching NumPy dtype
+        return wavfile.read(file_path)
+
+def load_audio(file_path, dtype=None, mono=True):
+    """
+    Loads audio file in any format
+
+    WAV files are memory-mapped (zero copy, paged in lazily) and keep their
+    native sample dtype; other formats are decoded through an ffmpeg pipe.
+
+    Args:
+        file_path: Audio file path
+        dtype: Sample dtype for decoded (non-WAV) files; default int16
+        mono: Downmix multi-channel audio to one channel (chunked); pass
+            False to keep the channels
+
+    Returns:
+        tuple: (sample_rate, samples) with samples 1D for mono, else frames x channels
+    """
+    try:
+        with stage("load"):
+            if not file_path.lower().endswith('.wav'):
+                sample_rate, samples = decode_audio(file_path, dtype or np.int16)
+                if samples.shape[1] == 1:
+                    samples = samples[:, 0]
+            else:
+                sample_rate, samples = _load_wav(file_path)
+
+            if mono:
+                samples = downmix(samples)
+
+        return sample_rate, samples
     
     except Exception as e:
         print(f"Error loading audio: {str(e)}")
         return None, None
 
-def save_audio(file_path, sample_rate, data):
-    """Saves audio as WAV file"""
+# WAV stores 8-bit samples unsigned and wider samples signed; integer types
+# with the other signedness are shifted by half their range (sign bit flipped)
+_WAV_SIGN_FLIP = {
+    np.dtype(np.int8): np.uint8,
+    np.dtype(np.uint16): np.int16,
+    np.dtype(np.uint32): np.int32,
+}
+
+def save_audio(file_path, sample_rate, data, chunk_frames=AUDIO_CHUNK_FRAMES):
+    """
+    Saves audio as a PCM WAV file, streaming it to disk in chunks
+
+    Float data is treated as [-1, 1] and written as 16-bit; integer data is
+    written at its own width (int8, uint16 and uint32 converted to the WAV
+    signedness). Only one chunk is converted at a time.
+    """
     try:
-        # Convert numpy array to AudioSegment
-        if data.dtype != np.int16:
-            data = (data * 32767).astype(np.int16)
-            
-        audio = AudioSegment(
-            data.tobytes(),
-            frame_rate=sample_rate,
-            sample_width=data.dtype.itemsize,
-            channels=1
-        )
-        audio.export(file_path, format="wav")
+        is_float = data.dtype.kind == 'f'
+        if not is_float and (data.dtype.kind not in 'iu' or data.dtype.itemsize > 4):
+            raise ValueError(f"Unsupported sample dtype {data.dtype}")
+        channels = 1 if data.ndim == 1 else data.shape[1]
+        flip = _WAV_SIGN_FLIP.get(data.dtype.newbyteorder('='))
+
+        with wave.open(file_path, 'wb') as out:
+            out.setnchannels(channels)
+            out.setsampwidth(2 if is_float else data.dtype.itemsize)
+            out.setframerate(int(sample_rate))
+            for start in range(0, len(data), chunk_frames):
+                chunk = data[start:start + chunk_frames]
+                if is_float:
+                    chunk = np.clip(chunk * 32767, -32768, 32767).astype(np.int16)
+                elif flip is not None:
+                    unsigned = chunk.astype(np.dtype(f'u{chunk.dtype.itemsize}'))
+                    unsigned ^= 1 << (8 * chunk.dtype.itemsize - 1)
+                    chunk = unsigned.view(flip)
+                out.writeframes(np.ascontiguousarray(chunk, dtype=chunk.dtype.newbyteorder('<')).tobytes())
         print(f"Audio saved to {file_path}")
     except Exception as e:
         print(f"Error saving audio: {str(e)}")
 
-def plot_audio_comparison(original, filtered, sample_rate, cutoff, filter_type):
+def stream_filter_interactive(data, sample_rate, cutoff):
+    """Designs a FIR/biquad filter from prompts and runs it block by block"""
+    from audio_filters import iter_blocks
+    from block_filters import (
+        DEFAULT_BLOCK_SIZE,
+        design_fir,
+        design_biquad_cascade,
+        stream_filter,
+        latency_samples,
+        measure_block_throughput
+    )
+    while True:
+        engine = input("Engine (fir/biquad) [biquad]: ").strip().lower() or 'biquad'
+        if engine in ('fir', 'biquad'):
+            break
+        print("Engine must be fir or biquad")
+    kinds = ('low', 'high', 'band') if engine == 'fir' else ('low', 'high', 'band', 'lowshelf', 'highshelf')
+    kind = input(f"Type ({'/'.join(kinds)}) [low]: ").strip().lower() or 'low'
+    if kind not in kinds:
+        raise ValueError(f"Invalid filter type '{kind}'")
+
+    if engine == 'fir':
+        if kind == 'band':
+            width = get_float_input("Bandwidth (Hz): ", 1, sample_rate / 2)
+            cutoff_hz = (max(1.0, cutoff - width / 2), min(sample_rate / 2 - 1, cutoff + width / 2))
+        else:
+            cutoff_hz = cutoff
+        coeffs = design_fir(sample_rate, cutoff_hz, kind)
+    else:
+        q, gain_db = 1 / np.sqrt(2), 0.0
+        if kind == 'band':
+            q = get_float_input("Q (0.1-20): ", 0.1, 20)
+        elif kind.endswith('shelf'):
+            gain_db = get_float_input("Shelf gain in dB (-24 to 24): ", -24, 24)
+        coeffs = design_biquad_cascade(sample_rate, cutoff, kind, q=q, gain_db=gain_db)
+
+    stats = measure_block_throughput(coeffs, DEFAULT_BLOCK_SIZE, sample_rate)
+    print(f"Latency: {latency_samples(coeffs)} samples "
+          f"({1000 * latency_samples(coeffs) / sample_rate:.1f} ms) | "
+          f"{stats['us_per_block']:.1f} us/block ({stats['realtime_factor']:.0f}x real time)")
+
+    with stage(f"filter:{engine} {kind}"):
+        filtered = np.concatenate(list(stream_filter(iter_blocks(data, DEFAULT_BLOCK_SIZE), coeffs)))
+    return filtered, f"{engine.upper()} {kind}"
+
+def plot_spectrogram(signal, sample_rate, title="Spectrogram"):
+    """Displays a time-frequency magnitude spectrogram (dB) of an audio signal"""
+    import matplotlib.pyplot as plt
+    from stft import spectrogram
+    with stage("plot"):
+        times, freqs, magnitude_db = spectrogram(signal, sample_rate)
+        
+        plt.figure(figsize=(12, 5))
+        plt.imshow(magnitude_db, origin='lower', aspect='auto', cmap='magma',
+                   extent=(times[0], times[-1], freqs[0], freqs[-1]),
+                   vmin=magnitude_db.max() - 90, vmax=magnitude_db.max())
+        plt.colorbar(label="Magnitude (dB)")
+        plt.title(title)
+        plt.xlabel("Time (s)")
+        plt.ylabel("Frequency (Hz)")
+    plt.show()
+
+def plot_audio_comparison(original, filtered, sample_rate, cutoff, filter_type, original_spectrum=None):
     """Plots time and frequency domains with both original and filtered signals"""
-    plt.figure(figsize=(12, 8))
+    import matplotlib.pyplot as plt
+    with stage("plot"):
+        plt.figure(figsize=(12, 8))
     
-    # Time domain comparison
-    plt.subplot(2, 1, 1)
-    time = np.arange(len(original))/sample_rate
-    plt.plot(time[:1000], original[:1000], label='Original')
-    plt.plot(time[:1000], filtered[:1000], alpha=0.7, label='Filtered')
-    plt.title(f"Time Domain - {filter_type} Filter (Cutoff: {cutoff}Hz)")
-    plt.xlabel("Time (s)")
-    plt.ylabel("Amplitude")
-    plt.legend()
-    plt.grid(True)
+        # Time domain comparison
+        plt.subplot(2, 1, 1)
+        time = np.arange(min(1000, len(original)))/sample_rate
+        plt.plot(time, original[:1000], label='Original')
+        plt.plot(time, filtered[:1000], alpha=0.7, label='Filtered')
+        plt.title(f"Time Domain - {filter_type} Filter (Cutoff: {cutoff}Hz)")
+        plt.xlabel("Time (s)")
+        plt.ylabel("Amplitude")
+        plt.legend()
+        plt.grid(True)
     
-    # Frequency domain comparison
-    plt.subplot(2, 1, 2)
-    N = len(original)
+        # Frequency domain comparison
+        plt.subplot(2, 1, 2)
+        width = _plot_width_px()
     
-    # Calculate FFT for both signals
-    yf_orig = fft(original)
-    yf_filt = fft(filtered)
-    xf = fftfreq(N, 1/sample_rate)[:N//2]
+        # The original spectrum is reused when the caller already computed it
+        if original_spectrum is None:
+            original_spectrum = audio_spectrum(original, sample_rate)
+        filtered_spectrum = audio_spectrum(filtered, sample_rate)
     
-    plt.plot(xf, 2/N * np.abs(yf_orig[:N//2]), label='Original')
-    plt.plot(xf, 2/N * np.abs(yf_filt[:N//2]), alpha=0.7, label='Filtered')
+        plt.plot(*minmax_envelope(*original_spectrum, width), label='Original')
+        plt.plot(*minmax_envelope(*filtered_spectrum, width), alpha=0.7, label='Filtered')
     
-    # Add cutoff line
-    plt.axvline(x=cutoff, color='r', linestyle='--', 
-               label=f'Cutoff: {cutoff}Hz')
+        # Add cutoff line
+        plt.axvline(x=cutoff, color='r', linestyle='--', 
+                   label=f'Cutoff: {cutoff}Hz')
     
-    plt.title("Frequency Domain Comparison")
-    plt.xlabel("Frequency (Hz)")
-    plt.ylabel("Magnitude")
-    plt.legend()
-    plt.grid(True)
+        plt.title("Frequency Domain Comparison")
+        plt.xlabel("Frequency (Hz)")
+        plt.ylabel("Magnitude")
+        plt.legend()
+        plt.grid(True)
     
-    plt.tight_layout()
-    plt.show()
\ No newline at end of file
+        plt.tight_layout()
+    plt.show()
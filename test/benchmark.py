@@ -0,0 +1,181 @@
+"""Performance benchmark for every filter in filters/.
+
+Times each filter over a matrix of synthetic image sizes / channel counts and
+audio lengths, reporting median time, throughput and peak memory. Results are
+written as JSON and can be compared against a stored baseline; the script exits
+with status 1 when a filter got slower than the allowed threshold.
+
+Usage:
+    python test/benchmark.py --output bench.json
+    python test/benchmark.py --quick --baseline bench.json --threshold 0.25
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'filters'))
+
+from grayscale import grayscale
+from edge_detection import sobel_edge_detection
+from horizontal_flip import horizontal_flip
+from resize import resize_bilinear
+from sharpen import sharpen
+from brightness import adjust_brightness
+from contrast import adjust_contrast
+from clahe import clahe
+from gaussian_blur import gaussian_blur, box_blur
+from saturation import adjust_saturation
+from color import rgb_to_hsv
+from audio_filters import fft_filter
+
+IMAGE_SIZES = [(256, 256), (1080, 1920), (3000, 4000)]
+QUICK_IMAGE_SIZES = [(128, 128), (512, 512)]
+CHANNEL_COUNTS = [1, 3]
+SAMPLE_RATE = 44100
+AUDIO_SECONDS = [1, 30, 300]
+QUICK_AUDIO_SECONDS = [1, 5]
+
+# name -> (callable(image), needs RGB input)
+IMAGE_FILTERS = {
+    'grayscale': (grayscale, True),
+    'edge_detection': (sobel_edge_detection, False),
+    'horizontal_flip': (lambda x: horizontal_flip(x, copy=True), False),
+    'resize': (lambda x: resize_bilinear(x, x.shape[0] // 2, x.shape[1] // 2), False),
+    'sharpen': (sharpen, False),
+    'brightness': (lambda x: adjust_brightness(x, 1.2), False),
+    'contrast': (lambda x: adjust_contrast(x, 50, 200), False),
+    'contrast_percentile': (lambda x: adjust_contrast(x, mode='percentile'), False),
+    'contrast_equalize': (lambda x: adjust_contrast(x, mode='equalize'), False),
+    'clahe': (clahe, False),
+    'gaussian_blur_exact': (lambda x: gaussian_blur(x, 2.0, method='exact'), False),
+    'gaussian_blur_box': (lambda x: gaussian_blur(x, 10.0, method='box'), False),
+    'box_blur': (lambda x: box_blur(x, 15), False),
+    'saturation': (lambda x: adjust_saturation(x, 1.5), True),
+    'rgb_to_hsv': (rgb_to_hsv, True),
+}
+AUDIO_FILTERS = {
+    'fft_filter': lambda x: fft_filter(x, SAMPLE_RATE, 1000, 'low'),
+}
+
+
+def measure(func, data, repeats):
+    """Returns (median seconds, peak traced bytes) for func(data)."""
+    func(data)  # Warm-up (caches, lazy imports, page faults)
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func(data)
+        times.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    func(data)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return statistics.median(times), peak
+
+
+def run_benchmarks(quick=False, repeats=5, only=None):
+    """Runs the benchmark matrix and returns {case: result dict}."""
+    rng = np.random.default_rng(0)
+    results = {}
+
+    for h, w in QUICK_IMAGE_SIZES if quick else IMAGE_SIZES:
+        for channels in CHANNEL_COUNTS:
+            shape = (h, w) if channels == 1 else (h, w, channels)
+            image = rng.integers(0, 256, shape, dtype=np.uint8)
+            for name, (func, needs_rgb) in IMAGE_FILTERS.items():
+                if (only and name not in only) or (needs_rgb and channels != 3):
+                    continue
+                seconds, peak = measure(func, image, repeats)
+                case = f"{name}/{h}x{w}x{channels}"
+                results[case] = {
+                    'median_s': seconds,
+                    'throughput': h * w / 1e6 / seconds,
+                    'unit': 'MP/s',
+                    'peak_mb': peak / 1e6,
+                }
+                print(f"{case:<36} {seconds * 1e3:10.2f} ms {results[case]['throughput']:10.1f} MP/s "
+                      f"{results[case]['peak_mb']:9.1f} MB")
+
+    for seconds_of_audio in QUICK_AUDIO_SECONDS if quick else AUDIO_SECONDS:
+        n = seconds_of_audio * SAMPLE_RATE
+        audio = (rng.standard_normal(n) * 3000).astype(np.int16)
+        for name, func in AUDIO_FILTERS.items():
+            if only and name not in only:
+                continue
+            seconds, peak = measure(func, audio, repeats)
+            case = f"{name}/{seconds_of_audio}s"
+            results[case] = {
+                'median_s': seconds,
+                'throughput': n / 1e6 / seconds,
+                'unit': 'Msamples/s',
+                'peak_mb': peak / 1e6,
+            }
+            print(f"{case:<36} {seconds * 1e3:10.2f} ms {results[case]['throughput']:10.1f} Msamples/s "
+                  f"{results[case]['peak_mb']:9.1f} MB")
+
+    return results
+
+
+def compare(results, baseline, threshold, min_seconds=1e-3):
+    """
+    Returns a list of (case, baseline s, current s) that slowed down by more than threshold.
+
+    Cases faster than min_seconds in both runs are ignored, since timer noise
+    dominates at that scale.
+    """
+    regressions = []
+    for case, result in results.items():
+        if case not in baseline:
+            continue
+        before, after = baseline[case]['median_s'], result['median_s']
+        if max(before, after) >= min_seconds and after > before * (1 + threshold):
+            regressions.append((case, before, after))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark all filters.")
+    parser.add_argument('--quick', action='store_true', help="small sizes only (CI smoke run)")
+    parser.add_argument('--repeats', type=int, default=5, help="timed runs per case (median is reported)")
+    parser.add_argument('--filters', nargs='*', help="only benchmark these filters")
+    parser.add_argument('--output', help="write results JSON here")
+    parser.add_argument('--baseline', help="results JSON to compare against")
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help="allowed slowdown vs baseline as a fraction (default 0.25)")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.quick, args.repeats, args.filters)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({
+                'python': platform.python_version(),
+                'numpy': np.__version__,
+                'machine': platform.machine(),
+                'results': results,
+            }, f, indent=2)
+        print(f"Results written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)['results']
+        regressions = compare(results, baseline, args.threshold)
+        for case, before, after in regressions:
+            print(f"REGRESSION {case}: {before * 1e3:.2f} ms -> {after * 1e3:.2f} ms "
+                  f"(+{(after / before - 1) * 100:.0f}%)")
+        if regressions:
+            return 1
+        print(f"No regressions beyond {args.threshold * 100:.0f}% against {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,5 @@
+"""pytest setup: the filter modules import each other by bare name, so filters/ goes on the path."""
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'filters'))
@@ -0,0 +1,86 @@
+"""Startup (import-time) benchmark for the filters entry points.
+
+Each entry module is imported in a fresh interpreter. The script checks that
+it stays within the import-time budget and that it does not load heavy
+dependencies it should only load on first use. numpy is imported first and
+timed separately, so the budget covers only the project's own import cost.
+The script exits with status 1 when a budget is exceeded.
+
+Budget (see filters/Readme.md):
+    main, batch   <= 100 ms on top of numpy; none of matplotlib, scipy,
+                  ffmpeg, imageio or pydub loaded at import time
+
+Usage:
+    python test/startup_benchmark.py
+    python test/startup_benchmark.py --repeats 10 --budget-ms 150
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+FILTERS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'filters')
+
+ENTRY_MODULES = ['main', 'batch']
+DEFAULT_BUDGET_MS = 100.0
+LAZY_MODULES = ['matplotlib', 'scipy', 'ffmpeg', 'imageio', 'pydub']
+
+# Runs in the child interpreter: times numpy, then the entry module on top of it
+CHILD = """
+import json, sys, time
+sys.path.insert(0, {filters_dir!r})
+start = time.perf_counter()
+import numpy
+numpy_s = time.perf_counter() - start
+start = time.perf_counter()
+import {module}
+module_s = time.perf_counter() - start
+print(json.dumps({{
+    'numpy_s': numpy_s,
+    'module_s': module_s,
+    'loaded': [m for m in {lazy!r} if m in sys.modules],
+}}))
+"""
+
+
+def measure_import(module, repeats):
+    """Returns (median numpy s, median module s, lazy modules loaded) over fresh interpreters."""
+    code = CHILD.format(filters_dir=FILTERS_DIR, module=module, lazy=LAZY_MODULES)
+    numpy_times, module_times, loaded = [], [], set()
+    for _ in range(repeats):
+        out = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True,
+                             check=True, cwd=FILTERS_DIR)
+        result = json.loads(out.stdout.strip().splitlines()[-1])
+        numpy_times.append(result['numpy_s'])
+        module_times.append(result['module_s'])
+        loaded.update(result['loaded'])
+    return statistics.median(numpy_times), statistics.median(module_times), sorted(loaded)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check the import-time budget of the entry modules.")
+    parser.add_argument('--repeats', type=int, default=5, help="fresh interpreters per module (median is reported)")
+    parser.add_argument('--budget-ms', type=float, default=DEFAULT_BUDGET_MS,
+                        help=f"allowed import time on top of numpy (default {DEFAULT_BUDGET_MS:.0f} ms)")
+    args = parser.parse_args(argv)
+
+    failed = False
+    for module in ENTRY_MODULES:
+        numpy_s, module_s, loaded = measure_import(module, args.repeats)
+        over_budget = module_s * 1e3 > args.budget_ms
+        print(f"{module:<8} {module_s * 1e3:8.1f} ms (numpy {numpy_s * 1e3:.1f} ms)"
+              f"{'  OVER BUDGET' if over_budget else ''}")
+        if loaded:
+            print(f"         loaded at import time: {', '.join(loaded)}")
+        failed |= over_budget or bool(loaded)
+
+    if failed:
+        return 1
+    print(f"All entry modules within {args.budget_ms:.0f} ms and free of lazy dependencies")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
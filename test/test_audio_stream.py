@@ -0,0 +1,42 @@
+"""Checks the streaming audio filter against the whole-signal FFT filter."""
+import numpy as np
+import pytest
+
+from audio_filters import fft_filter, fft_filter_stream, iter_blocks
+
+SAMPLE_RATE = 8000
+NUM_TAPS = 1025
+
+
+def two_tones(length=20000):
+    t = np.arange(length) / SAMPLE_RATE
+    return np.sin(2 * np.pi * 200 * t) + 0.5 * np.sin(2 * np.pi * 3000 * t)
+
+
+@pytest.mark.parametrize('filter_type', ['low', 'high'])
+@pytest.mark.parametrize('block_size', [1000, 4096, 30000])
+def test_stream_matches_fft_filter(filter_type, block_size):
+    audio = two_tones()
+    expected = fft_filter(audio, SAMPLE_RATE, 1000, filter_type)
+    streamed = np.concatenate(list(fft_filter_stream(iter_blocks(audio, block_size), SAMPLE_RATE, 1000,
+                                                     filter_type, num_taps=NUM_TAPS)))
+    assert streamed.shape == audio.shape
+    # The FIR only differs from the brick-wall mask near the edges of the signal
+    interior = slice(NUM_TAPS, -NUM_TAPS)
+    assert np.abs(streamed[interior] - expected[interior]).max() < 1e-2
+
+
+def test_stream_independent_of_block_size():
+    audio = two_tones(9000)
+    outputs = [np.concatenate(list(fft_filter_stream(iter_blocks(audio, size), SAMPLE_RATE, 1000,
+                                                     num_taps=NUM_TAPS)))
+               for size in (1, 777, 9000)]
+    assert np.allclose(outputs[0], outputs[1]) and np.allclose(outputs[0], outputs[2])
+
+
+def test_stream_keeps_dtype_and_handles_empty_input():
+    audio = (two_tones(5000) * 10000).astype(np.int16)
+    blocks = list(fft_filter_stream(iter_blocks(audio, 1024), SAMPLE_RATE, 1000, num_taps=NUM_TAPS))
+    assert all(block.dtype == np.int16 for block in blocks)
+    assert sum(len(block) for block in blocks) == len(audio)
+    assert list(fft_filter_stream(iter([]), SAMPLE_RATE, 1000)) == []
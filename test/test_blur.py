@@ -0,0 +1,98 @@
+"""Checks the blurs against naive window-mean and separable Gaussian references."""
+import math
+
+import numpy as np
+import pytest
+
+from gaussian_blur import EXACT_MAX_SIGMA, TRUNCATE, box_blur, gaussian_blur
+
+
+def naive_box_blur(image, radius):
+    """Mean of every reflect-padded (2 * radius + 1)^2 window, in float64."""
+    pad = [(radius, radius), (radius, radius)] + [(0, 0)] * (image.ndim - 2)
+    padded = np.pad(image.astype(np.float64), pad, mode='reflect')
+    window = 2 * radius + 1
+    height, width = image.shape[:2]
+    result = np.zeros(image.shape)
+    for dy in range(window):
+        for dx in range(window):
+            result += padded[dy:dy + height, dx:dx + width]
+    return result / window ** 2
+
+
+@pytest.mark.parametrize('shape', [(30, 40), (25, 19, 3), (16, 16, 4)])
+@pytest.mark.parametrize('radius', [0, 1, 3, 7])
+def test_box_blur_matches_naive(shape, radius):
+    image = np.random.default_rng(0).integers(0, 256, shape, dtype=np.uint8)
+    result = box_blur(image, radius)
+    assert result.dtype == np.uint8
+    # Only values within rounding error of a .5 tie may round the other way
+    assert np.abs(result - naive_box_blur(image, radius)).max() <= 0.5 + 1e-6
+
+
+def test_box_blur_in_place():
+    image = np.random.default_rng(1).integers(0, 256, (20, 30, 3), dtype=np.uint8)
+    expected = box_blur(image, 2)
+    assert box_blur(image, 2, out=image) is image
+    assert np.array_equal(image, expected)
+
+
+def naive_gaussian_blur(image, sigma, truncate=TRUNCATE):
+    """Sampled Gaussian over rows, then columns, reflect-padded, in float64."""
+    radius = max(1, math.ceil(truncate * sigma))
+    kernel = np.exp(-0.5 * (np.arange(-radius, radius + 1) / sigma) ** 2)
+    kernel /= kernel.sum()
+    pad = [(radius, radius), (radius, radius)] + [(0, 0)] * (image.ndim - 2)
+    padded = np.pad(image.astype(np.float64), pad, mode='reflect')
+    height, width = image.shape[:2]
+    rows = sum(k * padded[:, i:i + width] for i, k in enumerate(kernel))
+    return sum(k * rows[i:i + height] for i, k in enumerate(kernel))
+
+
+def checkerboard(height, width, square=20):
+    y, x = np.mgrid[:height, :width]
+    return ((y // square + x // square) % 2 * 255).astype(np.uint8)
+
+
+@pytest.mark.parametrize('shape', [(60, 50), (45, 40, 3)])
+@pytest.mark.parametrize('sigma', [0.7, 1.5, 3.0])
+def test_exact_matches_naive(shape, sigma):
+    image = np.random.default_rng(2).integers(0, 256, shape, dtype=np.uint8)
+    assert np.abs(gaussian_blur(image, sigma, method='exact') - naive_gaussian_blur(image, sigma)).max() <= 0.5 + 1e-3
+
+
+def test_exact_with_fft_passes():
+    # A 61-tap kernel on this size makes convolve2d pick FFT for the in-place passes
+    image = checkerboard(300, 300)
+    result = gaussian_blur(image, 10.0, method='exact')
+    assert np.abs(result - naive_gaussian_blur(image, 10.0)).max() <= 0.5 + 1e-3
+
+
+@pytest.mark.parametrize('sigma', [4.0, 6.0, 10.0])
+def test_box_approximates_gaussian(sigma):
+    # Compared with the Gaussian truncated far out, i.e. the true blur
+    noise = np.random.default_rng(3).integers(0, 256, (120, 100, 3), dtype=np.uint8)
+    assert np.abs(gaussian_blur(noise, sigma, method='box') - naive_gaussian_blur(noise, sigma, 6.0)).max() <= 1.5
+    # Hard 0/255 edges are the worst case for the piecewise-quadratic box result
+    edges = checkerboard(160, 140)
+    assert np.abs(gaussian_blur(edges, sigma, method='box') - naive_gaussian_blur(edges, sigma, 6.0)).max() <= 6
+
+
+@pytest.mark.parametrize('sigma', [EXACT_MAX_SIGMA, EXACT_MAX_SIGMA + 0.5])
+def test_auto_switches_at_exact_max_sigma(sigma):
+    image = checkerboard(80, 70)
+    expected = gaussian_blur(image, sigma, method='exact' if sigma <= EXACT_MAX_SIGMA else 'box')
+    assert np.array_equal(gaussian_blur(image, sigma), expected)
+
+
+@pytest.mark.parametrize('method', ['exact', 'box'])
+def test_gaussian_blur_in_place(method):
+    image = np.random.default_rng(4).integers(0, 256, (30, 40, 3), dtype=np.uint8)
+    expected = gaussian_blur(image, 2.0, method=method)
+    assert gaussian_blur(image, 2.0, method=method, out=image) is image
+    assert np.array_equal(image, expected)
+
+
+def test_sigma_zero_is_identity():
+    image = np.random.default_rng(5).integers(0, 256, (10, 12), dtype=np.uint8)
+    assert np.array_equal(gaussian_blur(image, 0), image)
@@ -0,0 +1,53 @@
+"""Checks reuse and the per-thread budget of the scratch buffer pool."""
+import threading
+
+import numpy as np
+import pytest
+
+import buffers
+from buffers import release_scratch, scratch, scratch_bytes
+
+
+@pytest.fixture(autouse=True)
+def empty_pool():
+    release_scratch()
+    yield
+    release_scratch()
+
+
+def test_same_tag_reuses_memory():
+    first = scratch('test.a', (100, 100))
+    again = scratch('test.a', (50, 50), np.uint8)
+    assert np.shares_memory(first, again)
+    assert not np.shares_memory(first, scratch('test.b', (100, 100)))
+
+
+def test_pool_stays_within_budget(monkeypatch):
+    monkeypatch.setattr(buffers, 'MAX_POOL_BYTES', 1000)
+    kept = scratch('test.a', (100,), np.uint8)
+    for tag in 'bcdefghijk':
+        scratch('test.' + tag, (300,), np.uint8)
+        assert scratch_bytes() <= 1000
+    # The least recently used buffer was dropped; the view stays valid
+    assert not np.shares_memory(kept, scratch('test.a', (100,), np.uint8))
+    kept[:] = 1
+    assert (kept == 1).all()
+
+
+def test_recent_use_protects_a_buffer(monkeypatch):
+    monkeypatch.setattr(buffers, 'MAX_POOL_BYTES', 1000)
+    first = scratch('test.a', (300,), np.uint8)
+    scratch('test.b', (300,), np.uint8)
+    scratch('test.a', (300,), np.uint8)  # Now the most recently used
+    scratch('test.c', (300,), np.uint8)
+    scratch('test.d', (300,), np.uint8)
+    assert np.shares_memory(first, scratch('test.a', (300,), np.uint8))
+
+
+def test_pools_are_per_thread():
+    scratch('test.a', (1000,), np.uint8)
+    held = []
+    thread = threading.Thread(target=lambda: held.append(scratch_bytes()))
+    thread.start()
+    thread.join()
+    assert held == [0] and scratch_bytes() == 1000
@@ -0,0 +1,80 @@
+"""Checks that the filter cache freezes only the arrays it owns."""
+import numpy as np
+import pytest
+
+import cache
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache():
+    cache.configure(memory_bytes=cache.DEFAULT_MEMORY_BYTES, disk_dir='')
+    cache.clear()
+    yield
+    cache.clear()
+
+
+def test_put_returns_read_only_copy():
+    array = np.arange(12, dtype=np.uint8).reshape(3, 4)
+    stored = cache.put('key', array)
+    assert not stored.flags.writeable
+    assert array.flags.writeable
+    assert not np.shares_memory(stored, array)
+    assert cache.get('key') is stored
+
+
+def test_put_copies_views_even_when_handed_over():
+    base = np.zeros((4, 4), dtype=np.uint8)
+    stored = cache.put('key', base[1:3], copy=False)
+    assert base.flags.writeable
+    assert not np.shares_memory(stored, base)
+
+
+def test_disk_tier_returns_read_only(tmp_path):
+    cache.configure(disk_dir=str(tmp_path))
+    cache.put('key', np.ones((2, 3), dtype=np.float32))
+    cache.clear()  # Memory tier only
+    loaded = cache.get('key')
+    assert loaded is not None and not loaded.flags.writeable
+    assert np.array_equal(loaded, np.ones((2, 3)))
+
+
+def test_run_chain_leaves_input_writeable():
+    rgb = np.random.default_rng(0).integers(0, 256, (8, 8, 3), dtype=np.uint8)
+    gray = cache.run_chain(rgb, [('grayscale', {})])
+    assert rgb.flags.writeable
+    assert not gray.flags.writeable
+
+    # grayscale returns a gray input unchanged; the cache must not freeze it
+    image = np.random.default_rng(1).integers(0, 256, (8, 8), dtype=np.uint8)
+    result = cache.run_chain(image, [('grayscale', {})])
+    assert image.flags.writeable
+    assert not result.flags.writeable
+    assert np.array_equal(result, image)
+
+
+def test_run_chain_reuses_cached_prefix():
+    image = np.random.default_rng(2).integers(0, 256, (8, 8, 3), dtype=np.uint8)
+    chain = [('grayscale', {}), ('horizontal_flip', {})]
+    first = cache.run_chain(image, chain)
+    misses = cache.stats()['misses']
+    assert cache.run_chain(image, chain) is first
+    assert cache.stats()['misses'] == misses
+
+
+def test_corrupt_disk_entry_is_dropped(tmp_path):
+    cache.configure(disk_dir=str(tmp_path))
+    (tmp_path / 'key.npy').write_bytes(b'\x93NUMPY truncated')
+    assert cache.get('key') is None
+    assert not (tmp_path / 'key.npy').exists()
+
+
+def test_failed_disk_write_leaves_no_temp_file(tmp_path, monkeypatch):
+    cache.configure(disk_dir=str(tmp_path))
+
+    def full_disk(*args, **kwargs):
+        raise OSError(28, 'No space left on device')
+
+    monkeypatch.setattr(cache.np, 'save', full_disk)
+    with pytest.raises(OSError):
+        cache.put('key', np.zeros(4))
+    assert list(tmp_path.iterdir()) == []
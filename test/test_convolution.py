@@ -0,0 +1,28 @@
+"""Correctness tests for the convolution engine."""
+import numpy as np
+import pytest
+
+from convolution import convolve2d
+
+
+@pytest.mark.parametrize('shape', [(40, 30), (33, 47, 3), (20, 25, 4)])
+@pytest.mark.parametrize('kernel_shape', [(3, 3), (5, 9), (15, 15)])
+def test_direct_matches_fft(shape, kernel_shape):
+    rng = np.random.default_rng(0)
+    image = rng.integers(0, 256, shape, dtype=np.uint8)
+    kernel = rng.standard_normal(kernel_shape).astype(np.float32)
+    direct = convolve2d(image, kernel, method='direct')
+    fft = convolve2d(image, kernel, method='fft')
+    scale = np.abs(kernel).sum() * 255
+    assert np.abs(direct.astype(np.float64) - fft).max() <= 1e-5 * scale
+
+
+def test_direct_matches_reference():
+    rng = np.random.default_rng(1)
+    image = rng.integers(0, 256, (12, 10), dtype=np.uint8)
+    kernel = rng.standard_normal((3, 5)).astype(np.float32)
+    padded = np.pad(image.astype(np.float64), ((1, 1), (2, 2)), mode='reflect')
+    flipped = kernel[::-1, ::-1].astype(np.float64)
+    expected = np.array([[(padded[y:y + 3, x:x + 5] * flipped).sum() for x in range(10)]
+                         for y in range(12)])
+    assert np.allclose(convolve2d(image, kernel, method='direct'), expected, atol=1e-3)
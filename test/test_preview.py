@@ -0,0 +1,66 @@
+"""Checks pyramid halving against block-mean and area-resize references."""
+import numpy as np
+import pytest
+
+from cache import content_key
+from preview import build_preview, halve, run_preview
+from resize import resize
+
+
+def block_mean(image):
+    """2x2 block means rounded half up, computed in int64."""
+    h, w = image.shape[0] // 2, image.shape[1] // 2
+    blocks = image[:2 * h, :2 * w].astype(np.int64).reshape((h, 2, w, 2) + image.shape[2:])
+    return ((blocks.sum(axis=(1, 3)) + 2) // 4).astype(np.uint8)
+
+
+SHAPES = [(64, 48), (64, 48, 3), (600, 10, 4), (1030, 34)]
+
+
+@pytest.mark.parametrize('shape', SHAPES)
+def test_halve_flat_bright_image(shape):
+    # Four pixels of 200 sum to 800, which wraps around in uint8
+    image = np.full(shape, 200, dtype=np.uint8)
+    assert np.array_equal(halve(image), image[0::2, 0::2])
+
+
+@pytest.mark.parametrize('shape', SHAPES)
+def test_halve_matches_block_mean(shape):
+    image = np.random.default_rng(0).integers(0, 256, shape, dtype=np.uint8)
+    assert np.array_equal(halve(image), block_mean(image))
+
+
+@pytest.mark.parametrize('shape', SHAPES)
+def test_halve_matches_area_resize(shape):
+    image = np.random.default_rng(1).integers(0, 256, shape, dtype=np.uint8)
+    expected = resize(image, shape[0] // 2, shape[1] // 2, method='area')
+    # Only ties (block sums of 4k + 2) may round differently
+    assert np.abs(halve(image).astype(int) - expected).max() <= 1
+
+
+def test_halve_drops_odd_edge():
+    image = np.random.default_rng(2).integers(0, 256, (9, 7, 3), dtype=np.uint8)
+    assert np.array_equal(halve(image), block_mean(image[:8, :6]))
+
+
+@pytest.mark.parametrize('dtype', [np.uint16, np.float32])
+def test_halve_keeps_dtype_and_range(dtype):
+    image = (np.random.default_rng(3).random((9, 14, 3)) * 4000).astype(dtype)
+    expected = image[:8].astype(np.float64).reshape(4, 2, 7, 2, 3).mean(axis=(1, 3))
+    result = halve(image)
+    assert result.dtype == dtype
+    assert np.abs(result - expected).max() <= (0.5 if dtype == np.uint16 else 1e-3)
+
+
+def test_halve_keeps_single_row():
+    image = np.arange(10, dtype=np.uint16).reshape(1, 10)
+    assert np.array_equal(halve(image), [[0, 2, 4, 6, 8]])
+
+
+def test_run_preview_contrast_on_uint16():
+    # Contrast histograms need uint8; other dtypes fall back to adjust_contrast
+    image = np.random.default_rng(3).integers(0, 4096, (64, 48), dtype=np.uint16)
+    preview = build_preview(image, content_key(image), display_size=(16, 16))
+    source, result = run_preview(preview, [('contrast', {})])
+    assert preview['level'] == 2 and source.dtype == np.uint16
+    assert result.dtype == np.uint8 and result.min() == 0 and result.max() == 255
@@ -0,0 +1,55 @@
+"""Checks the registry's contrast entry on images that have no uint8 histograms."""
+import numpy as np
+import pytest
+
+import cache
+from contrast import adjust_contrast
+from registry import apply_filter
+from tiling import process_tiled
+
+
+@pytest.mark.parametrize('dtype', [np.uint16, np.float32])
+@pytest.mark.parametrize('shape', [(16, 12), (16, 12, 3)])
+def test_contrast_beyond_uint8_matches_adjust_contrast(dtype, shape):
+    image = (np.random.default_rng(0).random(shape) * 1000).astype(dtype)
+    expected = adjust_contrast(image, 10, 200)
+    assert np.array_equal(apply_filter(image, 'contrast', min_out=10, max_out=200), expected)
+
+    cache.configure(disk_dir='')
+    cache.clear()
+    result = cache.run_chain(image, [('contrast', {'min_out': 10, 'max_out': 200})])
+    assert result.dtype == np.uint8 and np.array_equal(result, expected)
+
+
+def test_tiled_contrast_requires_uint8(tmp_path):
+    image = np.arange(64, dtype=np.uint16).reshape(8, 8)
+    with pytest.raises(ValueError, match='uint8'):
+        process_tiled(image, 'contrast', str(tmp_path / 'out.npy'), tile_size=4)
+
+
+def test_tiled_contrast_matches_whole_image(tmp_path):
+    image = np.random.default_rng(1).integers(20, 200, (10, 9, 3), dtype=np.uint8)
+    tiled = process_tiled(image, 'contrast', str(tmp_path / 'out.npy'), tile_size=4, mode='equalize')
+    assert np.array_equal(tiled, apply_filter(image, 'contrast', mode='equalize'))
+
+
+@pytest.mark.parametrize('mode', ['minmax', 'percentile', 'equalize'])
+@pytest.mark.parametrize('shape', [(20, 30), (20, 30, 3)])
+def test_contrast_modes_on_uint16_match_uint8(mode, shape):
+    # A uint8 image scaled to 16 bits must get the same result in every mode
+    image = np.random.default_rng(2).integers(30, 220, shape, dtype=np.uint8)
+    image[0, 0] = 0  # A dead pixel for the percentile stretch to ignore
+    params = {'mode': mode, 'min_out': 5, 'max_out': 250, 'low_pct': 2.0, 'high_pct': 97.0}
+    expected = apply_filter(image, 'contrast', **params)
+    wide = apply_filter(image.astype(np.uint16) * 257, 'contrast', **params)
+    assert wide.dtype == np.uint8
+    assert np.abs(wide.astype(int) - expected).max() <= 1
+
+
+def test_equalize_float_image():
+    image = np.random.default_rng(3).random((40, 50)).astype(np.float32)
+    result = adjust_contrast(image, mode='equalize')
+    # Distinct values are spread evenly over the output range, in order
+    order = np.argsort(image, axis=None)
+    assert result.ravel()[order[0]] == 0 and result.ravel()[order[-1]] == 255
+    assert (np.diff(result.ravel()[order].astype(int)) >= 0).all()
@@ -0,0 +1,26 @@
+"""Checks adjust_saturation against HSV/HSL round trips."""
+import numpy as np
+import pytest
+
+from color import rgb_to_hsv, hsv_to_rgb, rgb_to_hsl, hsl_to_rgb
+from saturation import adjust_saturation
+
+ROUND_TRIPS = {'hsv': (rgb_to_hsv, hsv_to_rgb), 'hsl': (rgb_to_hsl, hsl_to_rgb)}
+
+
+@pytest.mark.parametrize('space', ['hsv', 'hsl'])
+@pytest.mark.parametrize('factor', [0.0, 0.5, 1.0, 1.7, 4.0])
+def test_matches_round_trip(space, factor):
+    image = np.random.default_rng(0).integers(0, 256, (40, 50, 3), dtype=np.uint8)
+    to_space, to_rgb = ROUND_TRIPS[space]
+    converted = to_space(image)
+    converted[..., 1] = np.minimum(converted[..., 1] * factor, 1)
+    expected = to_rgb(converted)
+    assert np.abs(adjust_saturation(image, factor, space).astype(int) - expected).max() <= 1
+
+
+def test_alpha_passed_through_and_gray_unchanged():
+    rgba = np.random.default_rng(1).integers(0, 256, (10, 12, 4), dtype=np.uint8)
+    assert np.array_equal(adjust_saturation(rgba, 2.0)[..., 3], rgba[..., 3])
+    gray = rgba[..., 0]
+    assert adjust_saturation(gray, 2.0) is gray